@@ -2,12 +2,16 @@ import os
 import tempfile
 import unittest
 import uuid
+from dataclasses import dataclass
+from unittest.mock import Mock, patch
 
+from wbmbot_v3.utility import io_operations
 from wbmbot_v3.utility.application_store import (
     CompositeApplicationStore,
     FileApplicationStore,
     FirestoreApplicationStore,
     build_application_store,
+    build_composite_store,
 )
 from wbmbot_v3.utility.config_store import (
     FileConfigStore,
@@ -16,16 +20,16 @@ from wbmbot_v3.utility.config_store import (
 )
 
 
+@dataclass(slots=True, frozen=True)
 class DummyFlat:
-    def __init__(self, hash_value: str):
-        self.hash = hash_value
-        self.title = "Test Flat"
-        self.street = "Teststr 1"
-        self.zip_code = "10115"
-        self.total_rent = "1234"
-        self.size = "55"
-        self.rooms = "2"
-        self.wbs = False
+    hash: str
+    title: str = "Test Flat"
+    street: str = "Teststr 1"
+    zip_code: str = "10115"
+    total_rent: str = "1234"
+    size: str = "55"
+    rooms: str = "2"
+    wbs: bool = False
 
 
 class FileApplicationStoreTests(unittest.TestCase):
@@ -36,13 +40,62 @@ class FileApplicationStoreTests(unittest.TestCase):
             store.initialize()
 
             email = "user@example.com"
-            flat = DummyFlat(hash_value="hash-123")
+            flat = DummyFlat(hash="hash-123")
 
             self.assertFalse(store.has_applied(email, flat))
             store.record_application(email, flat)
             self.assertTrue(store.has_applied(email, flat))
             self.assertTrue(os.path.isfile(log_path))
 
+    def test_file_store_loads_existing_log_on_initialize(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir, "successful_applications.json")
+            email = "user@example.com"
+            flat = DummyFlat(hash="hash-456")
+
+            writer = FileApplicationStore(log_path)
+            writer.initialize()
+            writer.record_application(email, flat)
+
+            reader = FileApplicationStore(log_path)
+            reader.initialize()
+            self.assertTrue(reader.has_applied(f" {email} ", flat))
+            self.assertFalse(reader.has_applied(email, DummyFlat("hash-other")))
+
+    def test_file_store_sees_entries_written_by_another_process(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir, "successful_applications.json")
+            reader = FileApplicationStore(log_path)
+            reader.initialize()
+
+            email = "user@example.com"
+            flat = DummyFlat(hash="hash-external")
+            self.assertFalse(reader.has_applied(email, flat))
+
+            writer = FileApplicationStore(log_path)
+            writer.initialize()
+            writer.record_application(email, flat)
+            stat = os.stat(log_path)
+            os.utime(log_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+            self.assertTrue(reader.has_applied(email, flat))
+
+    def test_file_store_records_batch(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir, "successful_applications.json")
+            store = FileApplicationStore(log_path)
+            store.initialize()
+
+            flats = [DummyFlat(hash=f"hash-{index}") for index in range(3)]
+            store.record_applications(
+                [("user@example.com", flat_obj) for flat_obj in flats]
+            )
+
+            reader = FileApplicationStore(log_path)
+            reader.initialize()
+            for flat_obj in flats:
+                self.assertTrue(reader.has_applied("user@example.com", flat_obj))
+
     def test_build_store_defaults_to_file(self):
         store = build_application_store("file", "/tmp/does-not-matter.json")
         self.assertIsInstance(store, FileApplicationStore)
@@ -72,7 +125,7 @@ class CompositeApplicationStoreTests(unittest.TestCase):
             composite.initialize()
 
             email = "composite@example.com"
-            flat = DummyFlat(hash_value="hash-composite")
+            flat = DummyFlat(hash="hash-composite")
 
             self.assertFalse(composite.has_applied(email, flat))
             composite.record_application(email, flat)
@@ -80,6 +133,78 @@ class CompositeApplicationStoreTests(unittest.TestCase):
             self.assertTrue(store_one.has_applied(email, flat))
             self.assertTrue(store_two.has_applied(email, flat))
 
+    def test_composite_applied_keys_unions_stores(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_one = FileApplicationStore(os.path.join(temp_dir, "one.json"))
+            store_two = FileApplicationStore(os.path.join(temp_dir, "two.json"))
+            composite = CompositeApplicationStore([store_one, store_two])
+            composite.initialize()
+
+            first = DummyFlat(hash="hash-first")
+            second = DummyFlat(hash="hash-second")
+            third = DummyFlat(hash="hash-third")
+            store_one.record_application("a@example.com", first)
+            store_two.record_application("b@example.com", second)
+
+            applied = composite.applied_keys(
+                [
+                    ("a@example.com", first),
+                    ("b@example.com", second),
+                    ("a@example.com", third),
+                ]
+            )
+
+            self.assertEqual(
+                applied,
+                {("a@example.com", "hash-first"), ("b@example.com", "hash-second")},
+            )
+
+    def test_composite_fills_earlier_stores_on_hit(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = FileApplicationStore(os.path.join(temp_dir, "cache.json"))
+            remote = FileApplicationStore(os.path.join(temp_dir, "remote.json"))
+            composite = CompositeApplicationStore([cache, remote])
+            composite.initialize()
+
+            email = "fill@example.com"
+            flat = DummyFlat(hash="hash-fill")
+            other = DummyFlat(hash="hash-other")
+            remote.record_application(email, flat)
+            remote.record_application(email, other)
+
+            self.assertTrue(composite.has_applied(email, flat))
+            self.assertTrue(cache.has_applied(email, flat))
+            self.assertEqual(
+                composite.applied_keys([(email, other)]), {(email, "hash-other")}
+            )
+            self.assertTrue(cache.has_applied(email, other))
+            # Hits are only remembered; the cache never gets invented records
+            self.assertEqual(
+                io_operations.load_application_log(cache.log_file_path), {}
+            )
+
+    def test_composite_cache_fill_can_be_disabled(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = FileApplicationStore(os.path.join(temp_dir, "cache.json"))
+            remote = FileApplicationStore(os.path.join(temp_dir, "remote.json"))
+            composite = CompositeApplicationStore([cache, remote], cache_fill=False)
+            composite.initialize()
+
+            flat = DummyFlat(hash="hash-nofill")
+            remote.record_application("nofill@example.com", flat)
+
+            self.assertTrue(composite.has_applied("nofill@example.com", flat))
+            self.assertFalse(cache.has_applied("nofill@example.com", flat))
+
+    def test_build_composite_store_returns_single_store(self):
+        store = FileApplicationStore("/tmp/does-not-matter.json")
+
+        self.assertIs(build_composite_store([store, None]), store)
+        self.assertIsInstance(
+            build_composite_store([store, FileApplicationStore("/tmp/other.json")]),
+            CompositeApplicationStore,
+        )
+
 
 class FirestoreApplicationStoreTests(unittest.TestCase):
     @unittest.skipUnless(
@@ -107,11 +232,12 @@ class FirestoreApplicationStoreTests(unittest.TestCase):
 
         email = "integration-test@example.com"
         flat_hash = uuid.uuid4().hex
-        flat = DummyFlat(hash_value=flat_hash)
+        flat = DummyFlat(hash=flat_hash)
 
         self.assertFalse(store.has_applied(email, flat))
         store.record_application(email, flat)
         self.assertTrue(store.has_applied(email, flat))
+        store.flush()
 
         if os.getenv("KEEP_FIRESTORE_TEST_DOCS") != "1":
             try:
@@ -121,10 +247,121 @@ class FirestoreApplicationStoreTests(unittest.TestCase):
                 pass
 
 
+class FirestoreBatchWriteTests(unittest.TestCase):
+    def test_record_applications_commits_in_batches(self):
+        store = FirestoreApplicationStore(collection="applications")
+        store._client = Mock()
+        store._collection = Mock()
+        store._google_api_error = RuntimeError
+
+        items = [
+            ("user@example.com", DummyFlat(hash=f"hash-{index}")) for index in range(5)
+        ]
+        store.record_applications(items, batch_size=2)
+
+        self.assertEqual(store._client.batch.call_count, 3)
+        batch = store._client.batch.return_value
+        self.assertEqual(batch.set.call_count, 5)
+        self.assertEqual(batch.commit.call_count, 3)
+
+    def test_applied_keys_reads_legacy_ids_only_for_misses(self):
+        store = FirestoreApplicationStore(collection="applications")
+        store._client = Mock()
+        store._collection = Mock()
+        store._collection.document.side_effect = lambda doc_id: doc_id
+        store._google_api_error = RuntimeError
+
+        email = "user@example.com"
+        applied_flat = DummyFlat(hash="hash-applied")
+        other_flat = DummyFlat(hash="hash-other")
+        applied_id = store._doc_id(email, applied_flat.hash)
+        store._client.get_all.side_effect = lambda refs: [
+            Mock(id=ref, exists=ref == applied_id) for ref in refs
+        ]
+
+        items = [(email, applied_flat), (email, other_flat)]
+        self.assertEqual(store.applied_keys(items), {(email, "hash-applied")})
+        current_refs, legacy_refs = (
+            call.args[0] for call in store._client.get_all.call_args_list
+        )
+        self.assertEqual(len(current_refs), 2)
+        self.assertEqual(legacy_refs, [store._legacy_doc_id(email, other_flat.hash)])
+
+        # The legacy miss is remembered, so repeat checks read only current IDs
+        store._client.get_all.reset_mock()
+        self.assertEqual(store.applied_keys(items), {(email, "hash-applied")})
+        self.assertEqual(store._client.get_all.call_count, 1)
+        self.assertEqual(len(store._client.get_all.call_args.args[0]), 1)
+
+        # Known applications are answered without another round-trip
+        store._client.get_all.reset_mock()
+        self.assertEqual(
+            store.applied_keys([(email, applied_flat)]), {(email, "hash-applied")}
+        )
+        store._client.get_all.assert_not_called()
+
+    def test_applied_keys_finds_legacy_sha256_documents(self):
+        store = FirestoreApplicationStore(collection="applications")
+        store._client = Mock()
+        store._collection = Mock()
+        store._collection.document.side_effect = lambda doc_id: doc_id
+        store._google_api_error = RuntimeError
+
+        email = "user@example.com"
+        flat = DummyFlat(hash="hash-legacy")
+        legacy_id = store._legacy_doc_id(email, flat.hash)
+        store._client.get_all.side_effect = lambda refs: [
+            Mock(id=ref, exists=ref == legacy_id, to_dict=lambda: {"email": email})
+            for ref in refs
+        ]
+
+        self.assertTrue(store.has_applied(email, flat))
+        self.assertEqual(len(store._doc_id(email, flat.hash)), 32)
+        self.assertEqual(len(legacy_id), 64)
+
+        # Hits are copied to the current ID so the legacy read is not repeated
+        batch = store._client.batch.return_value
+        batch.set.assert_called_once_with(
+            store._doc_id(email, flat.hash), {"email": email}, merge=True
+        )
+
+        store.legacy_lookup = False
+        store._known_applied.clear()
+        self.assertFalse(store.has_applied(email, flat))
+
+    def test_record_application_writes_in_background(self):
+        store = FirestoreApplicationStore(collection="applications")
+        store._client = Mock()
+        store._collection = Mock()
+        store._google_api_error = RuntimeError
+        store._start_background_writer()
+
+        email = "user@example.com"
+        flat = DummyFlat(hash="hash-background")
+        store.record_application(email, flat)
+        self.assertTrue(store.has_applied(email, flat))
+
+        store.flush()
+        batch = store._client.batch.return_value
+        self.assertEqual(batch.set.call_count, 1)
+        self.assertEqual(batch.commit.call_count, 1)
+        store._client.get_all.assert_not_called()
+
+
 class FirestoreEntryTests(unittest.TestCase):
+    def test_doc_id_normalizes_email(self):
+        self.assertEqual(
+            FirestoreApplicationStore._doc_id(" User@Example.com ", "hash-1"),
+            FirestoreApplicationStore._doc_id("user@example.com", "hash-1"),
+        )
+        self.assertNotEqual(
+            FirestoreApplicationStore._doc_id("user@example.com", "hash-1"),
+            FirestoreApplicationStore._doc_id("user@example.com", "hash-2"),
+        )
+
     def test_build_entry_includes_address_and_applied_on(self):
         email = "user@example.com"
-        flat = DummyFlat(hash_value="hash-entry")
+        flat = DummyFlat(hash="hash-entry")
         entry = FirestoreApplicationStore._build_entry(email, flat)
 
         self.assertEqual(entry["email"], email)
@@ -135,6 +372,193 @@ class FirestoreEntryTests(unittest.TestCase):
         self.assertIn(flat.street, entry["address"])
         self.assertIn(flat.zip_code, entry["address"])
 
+    def test_record_applications_shares_batch_timestamp(self):
+        store = FirestoreApplicationStore(collection="applications")
+        store._client = Mock()
+        store._collection = Mock()
+        store._google_api_error = RuntimeError
+
+        items = [
+            ("user@example.com", DummyFlat(hash=f"hash-{index}")) for index in range(3)
+        ]
+        store.record_applications(items)
+
+        batch = store._client.batch.return_value
+        payloads = [call.args[1] for call in batch.set.call_args_list]
+        self.assertEqual(len({payload["created_at"] for payload in payloads}), 1)
+        self.assertEqual(len({payload["applied_on"] for payload in payloads}), 1)
+
+    def test_background_writer_commits_without_thread_pool(self):
+        store = FirestoreApplicationStore(collection="applications")
+        self.assertFalse(store.background_writes)
+        store._client = Mock()
+        store._collection = Mock()
+        store._google_api_error = RuntimeError
+        store._start_background_writer()
+
+        # Mirrors interpreter shutdown, where executors refuse new work
+        with patch(
+            "wbmbot_v3.utility.application_store.ThreadPoolExecutor",
+            side_effect=RuntimeError("cannot schedule new futures"),
+        ):
+            store.record_application("user@example.com", DummyFlat(hash="hash-exit"))
+            CompositeApplicationStore([store]).flush()
+
+        batch = store._client.batch.return_value
+        self.assertEqual(batch.commit.call_count, 1)
+
+    def test_failed_background_write_is_raised_by_flush(self):
+        store = FirestoreApplicationStore(collection="applications")
+        store._client = Mock()
+        store._collection = Mock()
+        store._google_api_error = RuntimeError
+        store._client.batch.return_value.commit.side_effect = ValueError("denied")
+        store._start_background_writer()
+
+        email = "user@example.com"
+        flat = DummyFlat(hash="hash-failed")
+        store.record_application(email, flat)
+
+        with self.assertRaises(RuntimeError):
+            store.flush()
+        self.assertNotIn(store._doc_id(email, flat.hash), store._known_applied)
+        store._client.get_all.return_value = []
+        self.assertFalse(store.has_applied(email, flat))
+
+
+class FileConfigStoreTests(unittest.TestCase):
+    def test_save_config_writes_atomically_and_skips_unchanged(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "wbm_config.json")
+            store = FileConfigStore(path, allow_prompt=False)
+
+            store.save_config("user", {"emails": ["a@example.com"]})
+            first_stat = os.stat(path)
+            store.save_config("user", {"emails": ["a@example.com"]})
+
+            self.assertEqual(os.stat(path).st_ino, first_stat.st_ino)
+            self.assertEqual(os.listdir(temp_dir), ["wbm_config.json"])
+
+            store.save_config("user", {"emails": ["b@example.com"]})
+            self.assertEqual(store.load_config(), {"emails": ["b@example.com"]})
+
+    def test_load_config_reuses_parse_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "wbm_config.json")
+            store = FileConfigStore(path, allow_prompt=False)
+            store.save_config("user", {"emails": ["a@example.com"]})
+
+            with patch(
+                "wbmbot_v3.utility.config_store.io_operations.load_wbm_config_no_prompt",
+                wraps=io_operations.load_wbm_config_no_prompt,
+            ) as load:
+                self.assertEqual(store.list_configs(), [{"emails": ["a@example.com"]}])
+                self.assertEqual(store.list_configs(), [{"emails": ["a@example.com"]}])
+                self.assertEqual(load.call_count, 1)
+
+                store.save_config("user", {"emails": ["b@example.com"]})
+                self.assertEqual(store.load_config(), {"emails": ["b@example.com"]})
+                self.assertEqual(load.call_count, 2)
+
+
+class FirestoreConfigStoreTests(unittest.TestCase):
+    def _store(self):
+        store = FirestoreConfigStore(collection="users")
+        store._client = Mock()
+        store._collection = Mock()
+        store._google_api_error = RuntimeError
+        return store
+
+    def test_save_configs_commits_in_batches(self):
+        store = self._store()
+
+        store.save_configs(
+            {f"user-{index}": {"emails": []} for index in range(5)}, batch_size=2
+        )
+
+        batch = store._client.batch.return_value
+        self.assertEqual(store._client.batch.call_count, 3)
+        self.assertEqual(batch.set.call_count, 5)
+        self.assertEqual(batch.commit.call_count, 3)
+        payload = batch.set.call_args_list[0].args[1]
+        self.assertEqual(payload["user_id"], "user-0")
+
+    def test_load_config_reuses_cached_copy_until_saved(self):
+        store = self._store()
+        document = store._collection.document.return_value
+        document.get.return_value = Mock(
+            exists=True, id="user-1", to_dict=lambda: {"emails": ["a@example.com"]}
+        )
+
+        first = store.load_config("user-1")
+        first["emails"].append("mutated@example.com")
+        second = store.load_config("user-1")
+
+        self.assertEqual(document.get.call_count, 1)
+        self.assertEqual(second["emails"], ["a@example.com"])
+        self.assertEqual(second["user_id"], "user-1")
+
+        store.load_config("user-1", source="server")
+        self.assertEqual(document.get.call_count, 2)
+
+        store.save_config("user-1", second)
+        store.load_config("user-1")
+        self.assertEqual(document.get.call_count, 3)
+
+    def test_list_configs_reads_whole_collection(self):
+        store = self._store()
+        store._collection.stream.return_value = [
+            Mock(id="user-1", to_dict=lambda: {"emails": [], "_id": "x"}),
+            Mock(id="user-2", to_dict=lambda: {"emails": [], "user_id": "user-2"}),
+        ]
+
+        configs = store.list_configs()
+
+        self.assertEqual([cfg["user_id"] for cfg in configs], ["user-1", "user-2"])
+        self.assertNotIn("_id", configs[0])
+
+    def test_load_configs_uses_single_get_all(self):
+        store = self._store()
+        store._collection.document.side_effect = lambda key: key
+        store._client.get_all.side_effect = lambda refs: [
+            Mock(id=ref, exists=ref != "missing", to_dict=lambda: {"emails": []})
+            for ref in reversed(refs)
+        ]
+
+        configs = store.load_configs(["user-1", "missing", "user-2"])
+
+        store._client.get_all.assert_called_once()
+        self.assertEqual(list(configs), ["user-1", "user-2"])
+        self.assertEqual(configs["user-2"]["user_id"], "user-2")
+
+    def test_load_config_retries_transient_errors(self):
+        from google.api_core.exceptions import ServiceUnavailable
+
+        store = self._store()
+        document = store._collection.document.return_value
+        document.get.side_effect = [
+            ServiceUnavailable("blip"),
+            Mock(exists=True, id="user-1", to_dict=lambda: {"emails": []}),
+        ]
+
+        with patch("wbmbot_v3.utility.firestore_support.time.sleep"):
+            config = store.load_config("user-1")
+
+        self.assertEqual(document.get.call_count, 2)
+        self.assertEqual(config["user_id"], "user-1")
+
+    def test_exists_fetches_only_user_id(self):
+        store = self._store()
+        document = store._collection.document.return_value
+        document.get.return_value = Mock(exists=False)
+
+        self.assertFalse(store.exists("user-1"))
+        document.get.assert_called_once_with(field_paths=["user_id"])
+
+    def test_save_config_requires_key(self):
+        with self.assertRaises(ValueError):
+            self._store().save_config("", {})
+
 
 if __name__ == "__main__":
     unittest.main()
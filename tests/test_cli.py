@@ -15,3 +15,31 @@ def test_module_cli_help_smoke():
 
     assert result.returncode == 0
     assert "python -m wbmbot_v3" in result.stdout
+
+
+def test_env_snapshot_reads_firestore_defaults(monkeypatch):
+    from wbmbot_v3.main import _env_snapshot
+
+    monkeypatch.setenv("FIRESTORE_PROJECT_ID", "demo-project")
+    monkeypatch.setenv("GITHUB_ACTIONS", "True")
+    monkeypatch.delenv("FIRESTORE_GITHUB_ACTIONS_COLLECTION", raising=False)
+    monkeypatch.setenv("FIRESTORE_LEGACY_LOOKUP", "0")
+
+    env = _env_snapshot()
+
+    assert env.firestore_project_id == "demo-project"
+    assert env.github_actions is True
+    assert env.github_actions_collection == "wbm_applications_github_actions"
+    assert env.firestore_legacy_lookup is False
+
+
+def test_parser_background_writes_default_from_env(monkeypatch):
+    from wbmbot_v3.main import parse_args
+
+    monkeypatch.setenv("FIRESTORE_BACKGROUND_WRITES", "1")
+
+    assert parse_args([]).firestore_background_writes is True
+    assert (
+        parse_args(["--no-firestore-background-writes"]).firestore_background_writes
+        is False
+    )
@@ -1,7 +1,10 @@
+import base64
 import logging
+import logging.handlers
 import os
 import tempfile
 import unittest
+from unittest.mock import patch
 
 from wbmbot_v3.helpers import debug_artifacts
 from wbmbot_v3.utility import io_operations
@@ -16,22 +19,19 @@ class DebugModeTests(unittest.TestCase):
             logger = logging.getLogger("debug-test")
             logger.info("debug log message")
 
-            root_logger = logging.getLogger()
-            for handler in root_logger.handlers:
-                if isinstance(handler, logging.FileHandler):
-                    handler.flush()
+            # Drain the background listener before reading the file
+            io_operations.stop_debug_logging(log_path)
 
             with open(log_path, "r", encoding="utf-8") as handle:
                 contents = handle.read()
 
             self.assertIn("debug log message", contents)
-
-            for handler in list(root_logger.handlers):
-                if isinstance(handler, logging.FileHandler) and os.path.abspath(
-                    handler.baseFilename
-                ) == os.path.abspath(log_path):
-                    handler.close()
-                    root_logger.removeHandler(handler)
+            self.assertFalse(
+                any(
+                    isinstance(handler, logging.handlers.QueueHandler)
+                    for handler in logging.getLogger().handlers
+                )
+            )
 
     def test_extract_pdf_link_from_html(self):
         html = "<a class='download' href='/files/expose.pdf'>Expos\u00e9</a>"
@@ -40,6 +40,72 @@ class DebugModeTests(unittest.TestCase):
         )
         self.assertEqual(link, "https://example.com/files/expose.pdf")
 
+    def test_find_expose_download_link_uses_single_script_call(self):
+        class DummyDriver:
+            current_url = "https://example.com/flat/1"
+            page_source = "<a href='/fallback.pdf'>PDF</a>"
+
+            def __init__(self, script_result):
+                self.script_result = script_result
+                self.script_calls = 0
+
+            def execute_script(self, script, *args):
+                self.script_calls += 1
+                return self.script_result
+
+        driver = DummyDriver("/files/expose.pdf")
+        self.assertEqual(
+            debug_artifacts._find_expose_download_link(driver),
+            "https://example.com/files/expose.pdf",
+        )
+        self.assertEqual(driver.script_calls, 1)
+
+        driver = DummyDriver(None)
+        self.assertEqual(
+            debug_artifacts._find_expose_download_link(driver),
+            "https://example.com/fallback.pdf",
+        )
+
+    def test_print_page_to_pdf_writes_devtools_output(self):
+        class DummyDriver:
+            def execute_cdp_cmd(self, command, params):
+                self.command = command
+                return {"data": base64.b64encode(b"%PDF-1.4").decode("ascii")}
+
+        driver = DummyDriver()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pdf_path = debug_artifacts._print_page_to_pdf(
+                driver, temp_dir, "Flat: Mitte/3 Zimmer"
+            )
+
+            self.assertEqual(driver.command, "Page.printToPDF")
+            self.assertEqual(os.path.basename(pdf_path), "Flat_Mitte_3_Zimmer.pdf")
+            with open(pdf_path, "rb") as handle:
+                self.assertEqual(handle.read(), b"%PDF-1.4")
+
+    def test_print_page_to_pdf_returns_none_without_devtools(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertIsNone(
+                debug_artifacts._print_page_to_pdf(object(), temp_dir, "flat")
+            )
+
+    def test_wait_before_next_application_ticks_until_deadline(self):
+        clock = {"now": 100.0}
+        sleeps = []
+
+        def _sleep(seconds):
+            sleeps.append(seconds)
+            clock["now"] += seconds
+
+        with (
+            patch.object(debug_artifacts.time, "monotonic", lambda: clock["now"]),
+            patch.object(debug_artifacts.time, "sleep", _sleep),
+            patch.object(debug_artifacts.sys, "stdout"),
+        ):
+            debug_artifacts.wait_before_next_application(12)
+
+        self.assertEqual(sleeps, [5, 5, 2])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,7 @@
-from wbmbot_v3.utility import eligibility
+import socket
+
+from wbmbot_v3.handlers.user import User
+from wbmbot_v3.utility import eligibility, misc_operations
 
 
 class DummyElement:
@@ -55,3 +58,132 @@ def test_evaluate_flat_eligibility_returns_allowed_when_matching():
 
     assert allowed is True
     assert reason is None
+
+
+def test_evaluate_flat_eligibility_reads_element_text_once():
+    class CountingElement:
+        def __init__(self, text: str):
+            self._text = text
+            self.reads = 0
+
+        @property
+        def text(self):
+            self.reads += 1
+            return self._text
+
+    element = CountingElement("Regular listing")
+    eligibility.evaluate_flat_eligibility(
+        element,
+        DummyFlat(),
+        DummyUser(exclude=["wbs", "senioren", "tausch"]),
+    )
+
+    assert element.reads == 1
+
+
+def test_evaluate_flat_eligibility_uses_precomputed_metrics():
+    metrics = eligibility.FlatMetrics(rent=900.0, size=60.0, rooms=2)
+
+    allowed, reason = eligibility.evaluate_flat_eligibility(
+        DummyElement("Regular listing"),
+        DummyFlat(),
+        DummyUser(rent="800"),
+        metrics=metrics,
+    )
+
+    assert allowed is False
+    assert "Flat Rent: 900.0 EUR" in reason
+    assert eligibility.measure_flat(DummyFlat()) == eligibility.FlatMetrics(
+        rent=600.0, size=60.0, rooms=2
+    )
+
+
+def test_contains_filter_keywords_with_pattern_matches_plain_scan():
+    filters = ["WBS", " Senioren ", "tausch"]
+    pattern = misc_operations.compile_filter_keywords(filters)
+
+    for text in ("Regular listing", "Seniorenwohnung mit WBS", "Wohnungstausch"):
+        element = DummyElement(text)
+        assert misc_operations.contains_filter_keywords(
+            element, filters, pattern
+        ) == misc_operations.contains_filter_keywords(element, filters)
+    assert misc_operations.compile_filter_keywords(["wbs", ""]) is None
+
+
+def test_user_exclude_pattern_is_compiled_once():
+    user = User({"exclude": ["WBS", "Senioren"]})
+
+    assert user.exclude_pattern is user.exclude_pattern
+    allowed, reason = eligibility.evaluate_flat_eligibility(
+        DummyElement("Seniorenwohnung"), DummyFlat(), user
+    )
+    assert allowed is False
+    assert reason == "it contains exclude keyword(s) --> Senioren"
+
+
+def test_convert_rent_and_size_parse_european_numbers():
+    assert misc_operations.convert_rent("Warmmiete 1.404,40 €") == 1404.40
+    assert misc_operations.convert_rent("1,234.5 €") == 1234.5
+    assert misc_operations.convert_rent("690 €") == 690.0
+    assert misc_operations.convert_size("Größe 60,09 m²") == 60.09
+
+
+def test_check_internet_connection_caches_success(monkeypatch):
+    calls = []
+
+    def _connect(address, timeout):
+        calls.append(address)
+        return socket.socket()
+
+    monkeypatch.setattr(misc_operations, "_last_online_at", None)
+    monkeypatch.setattr(misc_operations.socket, "create_connection", _connect)
+
+    assert misc_operations.check_internet_connection() is True
+    assert misc_operations.check_internet_connection() is True
+    assert len(calls) == 1
+
+
+def test_check_internet_connection_does_not_cache_failure(monkeypatch):
+    def _connect(address, timeout):
+        raise OSError("offline")
+
+    monkeypatch.setattr(misc_operations, "_last_online_at", None)
+    monkeypatch.setattr(misc_operations.socket, "create_connection", _connect)
+
+    assert misc_operations.check_internet_connection() is False
+    assert misc_operations._last_online_at is None
+
+
+def test_normalized_filters_report_original_keywords():
+    normalized = misc_operations.normalize_filters([" WBS ", "Senioren"])
+    element = DummyElement("Seniorenwohnung mit wbs")
+
+    assert normalized == (("wbs", " WBS "), ("senioren", "Senioren"))
+    assert misc_operations.has_filter_keyword(element, normalized) is True
+    assert misc_operations.contains_filter_keywords(
+        element, [], normalized=normalized
+    ) == (True, [" WBS ", "Senioren"])
+    assert (
+        misc_operations.has_filter_keyword(DummyElement("Balkon"), normalized) is False
+    )
+
+
+def test_contains_filter_keywords_skips_text_without_filters():
+    class UnreadableElement:
+        @property
+        def text(self):
+            raise AssertionError("text was read")
+
+    element = UnreadableElement()
+
+    assert misc_operations.contains_filter_keywords(element, []) == (False, [])
+    assert misc_operations.contains_filter_keywords(element, None) == (False, [])
+
+
+def test_parse_delay_to_seconds_accepts_unit_suffixes():
+    assert misc_operations.parse_delay_to_seconds("10s") == 10
+    assert misc_operations.parse_delay_to_seconds(" 1.5 M ") == 90
+    assert misc_operations.parse_delay_to_seconds("2h") == 7200
+    assert misc_operations.parse_delay_to_seconds("5.") == 5
+    assert misc_operations.parse_delay_to_seconds("1e3", default_seconds=7) == 7
+    assert misc_operations.parse_delay_to_seconds("-5s", default_seconds=7) == 7
@@ -0,0 +1,117 @@
+import hashlib
+
+from wbmbot_v3.handlers.flat import Flat
+
+LISTING_HTML = """<div class="row openimmo-search-list-item" data-id="51-5157/2/33">
+ <div class="col-6 immo-col stretch">
+ <article class="teaserBox variation-pt immo-element">
+ <div class="imgWrap">
+ <h2 class="imageTitle">***WBS 140*** 3-Zimmer- Wohnung in Friedrichshain</h2>
+ </div>
+ </article>
+ </div>
+ <div class="col-6 immo-col stretch">
+ <article class="immo-element">
+ <div class="textWrap">
+ <div class="area">Friedrichshain</div>
+ <div class="address">Colbestrasse 6,<br>10247 Berlin</div>
+ <ul class="main-property-list" data-cols="3">
+ <li class="main-property"><div class="main-property-label">Warmmiete</div><div class="main-property-value main-property-rent">690,39&nbsp;&euro;</div></li>
+ <li class="main-property"><div class="main-property-label">Größe</div><div class="main-property-value main-property-size">70,57 m²</div></li>
+ <li class="main-property"><div class="main-property-label">Zimmer</div><div class="main-property-value main-property-rooms">3</div></li>
+ </ul>
+ <ul class="check-property-list">
+ <li>Balkon</li>
+ </ul>
+ <div class="btn-holder">
+ <a title="Details" href="details.html">
+ Ansehen</a>
+ </div>
+ </div>
+ </article>
+ </div>
+ </div>"""
+
+LISTING_TEXT = "\n".join(
+    [
+        "2-Zimmer-Wohnung",
+        "Mitte",
+        "Teststraße 5",
+        "10115 Berlin",
+        "Warmmiete: 1.404,40 €",
+        "Größe: 60,09 m²",
+        "Zimmer: 2",
+    ]
+)
+
+
+def test_flat_parses_listing_html():
+    flat = Flat(LISTING_HTML, test=False)
+
+    assert flat.title == "***WBS 140*** 3-Zimmer- Wohnung in Friedrichshain"
+    assert flat.district == "Friedrichshain"
+    assert flat.street == "Colbestrasse 6"
+    assert flat.zip_code == "10247"
+    assert flat.city == "Berlin"
+    assert flat.total_rent == "690,39 €"
+    assert flat.size == "70,57 m²"
+    assert flat.rooms == "3"
+    assert flat.wbs is True
+    assert "Balkon" in flat.flat_attr
+
+
+def test_flat_parses_listing_text():
+    flat = Flat(LISTING_TEXT, test=False)
+
+    assert flat.title == "2-Zimmer-Wohnung"
+    assert flat.district == "Mitte"
+    assert flat.street == "Teststraße 5"
+    assert flat.zip_code == "10115"
+    assert flat.city == "Berlin"
+    assert flat.total_rent == "1.404,40 €"
+    assert flat.size == "60,09 m²"
+    assert flat.rooms == "2"
+    assert flat.wbs is False
+
+
+def test_flat_hash_is_stable_for_identical_sources():
+    first = Flat(LISTING_HTML, test=False)
+    second = Flat(LISTING_HTML, test=False)
+    other = Flat(LISTING_TEXT, test=False)
+
+    assert first.hash == second.hash
+    assert first.hash == hashlib.sha256(LISTING_HTML.encode("utf-8")).hexdigest()
+    assert first.hash != other.hash
+
+
+def test_flat_falls_back_to_regex_when_html_parser_fails(monkeypatch):
+    def _raise(_source):
+        raise ValueError("unsupported source")
+
+    monkeypatch.setattr("wbmbot_v3.handlers.flat.lxml.html.fromstring", _raise)
+    flat = Flat(LISTING_HTML, test=False)
+
+    assert flat.title == "***WBS 140*** 3-Zimmer- Wohnung in Friedrichshain"
+    assert flat.street == "Colbestrasse 6"
+    assert flat.total_rent == "690,39 €"
+
+
+def test_flat_hash_matches_sha256_across_chunk_boundaries():
+    source = "Größe 60,09 m² €\n" * 10_000
+
+    assert Flat._hash_text(source) == hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def test_normalize_text_matches_strict_unicode_normalization():
+    for value in ("Größe: 60,09 m²", "Straße", "Café ÄÖÜ", "Zimmer: ç"):
+        assert Flat._normalize_text(value) == Flat._normalize_text(value, strict=True)
+
+
+def test_parse_batch_preserves_order():
+    sources = [LISTING_HTML, LISTING_TEXT, LISTING_HTML]
+    flats = Flat.parse_batch(sources, test=False)
+
+    assert [flat_obj.hash for flat_obj in flats] == [
+        Flat(source, test=False).hash for source in sources
+    ]
+    assert flats[1].title == "2-Zimmer-Wohnung"
@@ -1,6 +1,9 @@
 from unittest.mock import Mock, patch
 
-from wbmbot_v3.utility.application_store import FirestoreApplicationStore
+from wbmbot_v3.utility.application_store import (
+    FirestoreApplicationStore,
+    build_application_store,
+)
 from wbmbot_v3.utility.config_store import FirestoreConfigStore
 
 
@@ -52,3 +55,24 @@ def test_config_store_initialize_uses_shared_firestore_client():
         credentials_path="/tmp/service-account.json",
     )
     assert store._collection is mock_collection
+
+
+def test_build_application_store_background_writes_commit_on_flush():
+    mock_client = Mock()
+    flat = Mock(hash="hash-1", total_rent="500 €", size="50 m²", rooms="2")
+
+    with patch(
+        "wbmbot_v3.utility.application_store.firestore_support.create_firestore_client",
+        return_value=(mock_client, RuntimeError),
+    ):
+        store = build_application_store(
+            "firestore", "unused.log", collection="applications", background_writes=True
+        )
+        store.initialize()
+
+    store.record_application("user@example.com", flat)
+    assert store.has_applied("user@example.com", flat)
+    store.flush()
+
+    mock_client.batch.return_value.commit.assert_called_once()
+    mock_client.collection.return_value.document.return_value.set.assert_not_called()
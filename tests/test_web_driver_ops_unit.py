@@ -109,6 +109,35 @@ class WebDriverOpsTests(unittest.TestCase):
         fill_form_mock.assert_called_once()
         send_mail_mock.assert_not_called()
 
+    @patch("wbmbot_v3.helpers.listing_processor.browser_actions.fill_form")
+    @patch("wbmbot_v3.helpers.listing_processor.browser_actions.ansehen_btn")
+    @patch("wbmbot_v3.helpers.listing_processor.debug_artifacts._debug_dump_page")
+    @patch("wbmbot_v3.helpers.listing_processor.debug_artifacts.download_expose_as_pdf")
+    def test_apply_to_flat_saves_pdf_before_filling_form(
+        self,
+        download_mock,
+        dump_mock,
+        ansehen_mock,
+        fill_form_mock,
+    ):
+        ansehen_mock.return_value = "https://example.com/flat"
+        calls = []
+        download_mock.side_effect = lambda *args, **kwargs: calls.append("pdf")
+        fill_form_mock.side_effect = lambda *args: calls.append("form")
+
+        lp.apply_to_flat(
+            DummyWebDriver(),
+            MagicMock(),
+            0,
+            "Test Flat",
+            DummyUser(),
+            "user@example.com",
+            test=False,
+            debug_dir="debug",
+        )
+
+        self.assertEqual(calls, ["pdf", "form"])
+
     @patch("wbmbot_v3.helpers.browser_actions.WebDriverWait")
     def test_next_page_does_not_increment_if_navigation_never_advances(
         self,
@@ -128,6 +157,55 @@ class WebDriverOpsTests(unittest.TestCase):
         with self.assertRaises(ba.LastPageReached):
             ba.next_page(driver, current_page=2, terminate_on_last_page=True)
 
+    def test_wait_for_flats_returns_rendered_rows(self):
+        driver = MagicMock()
+        driver.find_elements.return_value = ["row-1", "row-2"]
+
+        self.assertEqual(ba.wait_for_flats(driver, minimum=2), ["row-1", "row-2"])
+
+    @patch("wbmbot_v3.helpers.browser_actions.WebDriverWait")
+    def test_wait_for_flats_returns_current_rows_on_timeout(self, wait_mock):
+        driver = MagicMock()
+        driver.find_elements.return_value = ["row-1"]
+        wait_mock.return_value.until.side_effect = TimeoutException()
+
+        self.assertEqual(ba.wait_for_flats(driver, minimum=3), ["row-1"])
+
+    def test_wait_for_flat_looks_up_single_row_by_position(self):
+        driver = MagicMock()
+        driver.find_elements.return_value = ["row-3"]
+
+        self.assertEqual(ba.wait_for_flat(driver, 2), "row-3")
+        by, selector = driver.find_elements.call_args.args
+        self.assertTrue(selector.endswith("[3]"))
+
+    @patch("wbmbot_v3.helpers.browser_actions.WebDriverWait")
+    def test_wait_for_flat_returns_none_when_row_is_gone(self, wait_mock):
+        wait_mock.return_value.until.side_effect = TimeoutException()
+
+        driver = MagicMock()
+        driver.timeouts.implicit_wait = 5
+
+        self.assertIsNone(ba.wait_for_flat(driver, 5))
+        self.assertEqual(
+            [call.args for call in driver.implicitly_wait.call_args_list], [(0,), (5,)]
+        )
+
+    def test_sort_flats_by_rent_fetches_sources_in_one_call(self):
+        elements = [MagicMock(), MagicMock()]
+        driver = MagicMock()
+        driver.execute_script.return_value = [
+            "Expensive Flat\nMitte\nTeststr 1\n10115 Berlin\nWarmmiete: 900,00 €",
+            "Cheap Flat\nMitte\nTeststr 2\n10115 Berlin\nWarmmiete: 500,00 €",
+        ]
+
+        entries = lp.sort_flats_by_rent(elements, test=False, web_driver=driver)
+
+        driver.execute_script.assert_called_once()
+        for element in elements:
+            element.get_attribute.assert_not_called()
+        self.assertEqual([entry.index for entry in entries], [1, 0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import functools
 import os
 import stat
 
@@ -6,12 +7,45 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Driver binaries already confirmed (or made) executable in this process
+_EXECUTABLE_PATHS: set[str] = set()
+
+
+def _ensure_executable(path: str) -> str:
+    if path in _EXECUTABLE_PATHS:
+        return path
+    current_mode = os.stat(path).st_mode
+    executable_mode = current_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+    if executable_mode != current_mode:
+        try:
+            os.chmod(path, executable_mode)
+        except PermissionError:
+            # Not our file; fine as long as we can still run it
+            if not os.access(path, os.X_OK):
+                raise
+    _EXECUTABLE_PATHS.add(path)
+    return path
+
 
 class ChromeDriverConfigurator:
     """
     Class to create the WebDriver with ChromeOptions
     """
 
+    _BASE_ARGS = (
+        "--disable-extensions",
+        "--disable-gpu",
+        "--disable-logging",
+        "--log-level=3",
+    )
+    _HEADLESS_ARGS = (
+        "--headless",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--window-size=1920,1080",
+    )
+    _TEST_ARGS = ("--log-level=0",)
+
     def __init__(self, headless: bool, test: bool):
         """
         Create a ChromeDriver with default options
@@ -26,23 +60,19 @@ class ChromeDriverConfigurator:
         """
         Add ChromeOption defaults
         """
-        self.chrome_options.add_argument("--disable-extensions")
-        self.chrome_options.add_argument("--disable-gpu")
-        self.chrome_options.add_argument("--disable-logging")
-        self.chrome_options.add_argument("--log-level=3")
+        arguments = self._BASE_ARGS
         if self.headless:
-            self.chrome_options.add_argument("--headless")
-            self.chrome_options.add_argument("--no-sandbox")
-            self.chrome_options.add_argument("--disable-dev-shm-usage")
-            self.chrome_options.add_argument("--window-size=1920,1080")
+            arguments += self._HEADLESS_ARGS
         if self.test:
-            self.chrome_options.add_argument("--log-level=0")
+            arguments += self._TEST_ARGS
+        for argument in arguments:
+            self.chrome_options.add_argument(argument)
 
     def create_driver(self):
         """
         Creates the driver with the specified ChromeOptions
         """
-        driver_path = self._resolve_chromedriver_path(ChromeDriverManager().install())
+        driver_path = _cached_driver_path()
 
         self.driver = webdriver.Chrome(
             service=Service(driver_path),
@@ -61,34 +91,35 @@ class ChromeDriverConfigurator:
         Ensure the path returned by webdriver-manager points to an executable chromedriver.
         """
 
-        def ensure_executable(path: str) -> str:
-            if not os.access(path, os.X_OK):
-                current_mode = os.stat(path).st_mode
-                os.chmod(
-                    path,
-                    current_mode
-                    | stat.S_IXUSR
-                    | stat.S_IXGRP
-                    | stat.S_IXOTH,
-                )
-            return path
-
         base_name = os.path.basename(downloaded_path)
         if base_name.startswith("chromedriver") and not base_name.endswith(".chromedriver"):
-            return ensure_executable(downloaded_path)
+            return _ensure_executable(downloaded_path)
 
         driver_directory = (
             downloaded_path
             if os.path.isdir(downloaded_path)
             else os.path.dirname(downloaded_path)
         )
-        candidates = [
-            os.path.join(driver_directory, name)
-            for name in os.listdir(driver_directory)
-            if name.startswith("chromedriver") and not name.endswith(".chromedriver")
-        ]
-        for candidate in candidates:
-            if os.path.isfile(candidate):
-                return ensure_executable(candidate)
-
-        return ensure_executable(downloaded_path)
+        with os.scandir(driver_directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if (
+                    name.startswith("chromedriver")
+                    and not name.endswith(".chromedriver")
+                    and entry.is_file()
+                ):
+                    return _ensure_executable(entry.path)
+
+        return _ensure_executable(downloaded_path)
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_driver_path() -> str:
+    """
+    Resolve the chromedriver binary once per process; webdriver-manager
+    otherwise re-checks versions (and possibly the network) on every driver.
+    """
+
+    return ChromeDriverConfigurator._resolve_chromedriver_path(
+        ChromeDriverManager().install()
+    )
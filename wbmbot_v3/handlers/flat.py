@@ -1,7 +1,87 @@
+import functools
 import hashlib
 import html
+import os
 import re
+import sys
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+import lxml.html
+from lxml import etree
+
+from wbmbot_v3.logger import wbm_logger
+
+__appname__ = os.path.splitext(os.path.basename(__file__))[0]
+color_me = wbm_logger.ColoredLogger(__appname__)
+LOG = color_me.create_logger()
+
+# Regex fallback: one scan over the opening tags, classified per field
+_OPEN_TAG_RE = re.compile(r'<(h2|div)[^>]*?class="([^"]*)"[^>]*>', re.IGNORECASE)
+_CLOSE_TAG_RES = {
+    "h2": re.compile(r"</h2>", re.IGNORECASE),
+    "div": re.compile(r"</div>", re.IGNORECASE),
+}
+_CLASS_FIELDS = (
+    ("title", "h2", re.compile(r"imageTitle", re.IGNORECASE)),
+    ("district", "div", re.compile(r"area", re.IGNORECASE)),
+    ("address", "div", re.compile(r"address", re.IGNORECASE)),
+    (
+        "total_rent",
+        "div",
+        re.compile(r"main-property-value.*main-property-rent", re.IGNORECASE),
+    ),
+    (
+        "size",
+        "div",
+        re.compile(r"main-property-value.*main-property-size", re.IGNORECASE),
+    ),
+    (
+        "rooms",
+        "div",
+        re.compile(r"main-property-value.*main-property-rooms", re.IGNORECASE),
+    ),
+)
+_TITLE_XPATH = etree.XPath("//h2[contains(@class, 'imageTitle')]")
+_AREA_XPATH = etree.XPath("//div[contains(@class, 'area')]")
+_ADDRESS_XPATH = etree.XPath("//div[contains(@class, 'address')]")
+_RENT_XPATH = etree.XPath(
+    "//div[contains(@class, 'main-property-value')"
+    " and contains(@class, 'main-property-rent')]"
+)
+_SIZE_XPATH = etree.XPath(
+    "//div[contains(@class, 'main-property-value')"
+    " and contains(@class, 'main-property-size')]"
+)
+_ROOMS_XPATH = etree.XPath(
+    "//div[contains(@class, 'main-property-value')"
+    " and contains(@class, 'main-property-rooms')]"
+)
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_ZIP_WORD_RE = re.compile(r"\b\d{5}\b")
+_ZIP_RE = re.compile(r"\b(\d{5})\b\s*(.*)")
+_ZIP_CITY_RE = re.compile(r"(\d{5})\s+(.*)")
+_HASH_CHUNK_CHARS = 64 * 1024
+_MAX_PARSE_WORKERS = 8
+# Address lines end where the rent/size/rooms details begin
+_STOP_KEYWORDS = frozenset(("warmmiete", "kaltmiete", "grosse", "zimmer"))
+# German umlauts and common accents folded the same way NFKD + ASCII would
+_DE_TRANS = str.maketrans(
+    {
+        "ä": "a",
+        "ö": "o",
+        "ü": "u",
+        "Ä": "A",
+        "Ö": "O",
+        "Ü": "U",
+        "ß": "ss",
+        "é": "e",
+        "è": "e",
+        "É": "E",
+        "È": "E",
+    }
+)
 
 
 class Flat:
@@ -9,16 +89,42 @@ class Flat:
     Parse a single flat entry either from HTML or plain text.
     """
 
+    __slots__ = (
+        "test",
+        "flat_source",
+        "raw_html",
+        "flat_text",
+        "flat_attr",
+        "attr_size",
+        "title",
+        "district",
+        "street",
+        "zip_code",
+        "city",
+        "total_rent",
+        "size",
+        "rooms",
+        "wbs",
+        "hash",
+    )
+
     def __init__(self, flat_source: str, test: bool):
         self.test = test
         self.flat_source = flat_source or ""
         self.raw_html = flat_source if self._looks_like_html(flat_source) else ""
-        self.flat_text = self._to_text(flat_source)
-        self.flat_attr = [
-            line.strip() for line in self.flat_text.split("\n") if line.strip()
-        ]
+        tree = self._parse_tree(self.raw_html)
+        if tree is not None:
+            # Derive the text lines from the same tree the fields are read from
+            self.flat_attr = self._tree_lines(tree)
+            self.flat_text = "\n".join(self.flat_attr)
+        else:
+            self.flat_text = self._to_text(flat_source)
+            self.flat_attr = [
+                line.strip() for line in self.flat_text.split("\n") if line.strip()
+            ]
         self.attr_size = len(self.flat_attr)
-        print(self.flat_attr) if self.test else None
+        if self.test:
+            LOG.info(color_me.magenta(f"Flat attributes: {self.flat_attr}"))
 
         self.title = ""
         self.district = ""
@@ -29,8 +135,10 @@ class Flat:
         self.size = ""
         self.rooms = ""
 
-        if self.raw_html:
-            self._parse_from_html()
+        if tree is not None:
+            self._parse_from_html(tree)
+        elif self.raw_html:
+            self._parse_from_html_regex()
         else:
             self._parse_from_text(self.flat_attr)
 
@@ -38,30 +146,66 @@ class Flat:
         if not self.total_rent or not self.size or not self.rooms:
             self._parse_from_text(self.flat_attr, overwrite_missing=True)
 
+        # Few distinct values across listings; share one object per value
+        self.district = sys.intern(self.district)
+        self.zip_code = sys.intern(self.zip_code)
+        self.city = sys.intern(self.city)
+
         self.wbs = "wbs" in (self.title or "").lower() or "wbs" in self.flat_text.lower()
         identifier = self.raw_html or self.flat_text
-        self.hash = hashlib.sha256(identifier.encode("utf-8")).hexdigest()
+        self.hash = self._hash_text(identifier)
 
-    def _parse_from_html(self):
-        self.title = self._extract_html_value(
-            r'<h2[^>]*class="[^"]*imageTitle[^"]*"[^>]*>(.*?)</h2>'
-        )
-        self.district = self._extract_html_value(
-            r'<div[^>]*class="[^"]*area[^"]*"[^>]*>(.*?)</div>'
-        )
-        address_line = self._extract_html_value(
-            r'<div[^>]*class="[^"]*address[^"]*"[^>]*>(.*?)</div>'
-        )
+    @classmethod
+    def parse_batch(cls, sources: list[str], test: bool) -> list["Flat"]:
+        """
+        Parse several listings, preserving input order. lxml parsing and
+        SHA-256 hashing of larger inputs release the GIL, so threads overlap.
+        """
+
+        if len(sources) < 2:
+            return [cls(source, test) for source in sources]
+
+        workers = min(_MAX_PARSE_WORKERS, os.cpu_count() or 1, len(sources))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda source: cls(source, test), sources))
+
+    @staticmethod
+    def _parse_tree(raw_html: str):
+        if not raw_html:
+            return None
+        try:
+            return lxml.html.fromstring(raw_html)
+        except (etree.ParserError, ValueError):
+            return None
+
+    @staticmethod
+    def _tree_lines(tree) -> list[str]:
+        return [
+            stripped
+            for chunk in tree.itertext()
+            for line in chunk.splitlines()
+            if (stripped := line.strip())
+        ]
+
+    def _parse_from_html(self, tree):
+        self.title = self._extract_node_value(tree, _TITLE_XPATH)
+        self.district = self._extract_node_value(tree, _AREA_XPATH)
+        address_line = self._extract_node_value(tree, _ADDRESS_XPATH)
         self.street, self.zip_code, self.city = self._split_address(address_line)
-        self.total_rent = self._extract_html_value(
-            r'<div[^>]*class="[^"]*main-property-value[^"]*main-property-rent[^"]*"[^>]*>(.*?)</div>'
-        )
-        self.size = self._extract_html_value(
-            r'<div[^>]*class="[^"]*main-property-value[^"]*main-property-size[^"]*"[^>]*>(.*?)</div>'
-        )
-        self.rooms = self._extract_html_value(
-            r'<div[^>]*class="[^"]*main-property-value[^"]*main-property-rooms[^"]*"[^>]*>(.*?)</div>'
+        self.total_rent = self._extract_node_value(tree, _RENT_XPATH)
+        self.size = self._extract_node_value(tree, _SIZE_XPATH)
+        self.rooms = self._extract_node_value(tree, _ROOMS_XPATH)
+
+    def _parse_from_html_regex(self):
+        values = self._scan_html_values(self.raw_html)
+        self.title = values.get("title", "")
+        self.district = values.get("district", "")
+        self.street, self.zip_code, self.city = self._split_address(
+            values.get("address", "")
         )
+        self.total_rent = values.get("total_rent", "")
+        self.size = values.get("size", "")
+        self.rooms = values.get("rooms", "")
 
     def _parse_from_text(self, attributes, overwrite_missing: bool = False):
         attributes = attributes or []
@@ -75,12 +219,9 @@ class Flat:
         while address_index < len(attributes):
             candidate = attributes[address_index]
             normalized_candidate = self._normalize_text(candidate)
-            if re.search(r"\b\d{5}\b", candidate):
+            if _ZIP_WORD_RE.search(candidate):
                 break
-            if any(
-                keyword in normalized_candidate
-                for keyword in ("warmmiete", "kaltmiete", "grosse", "zimmer")
-            ):
+            if any(keyword in normalized_candidate for keyword in _STOP_KEYWORDS):
                 break
             street_parts.append(candidate)
             address_index += 1
@@ -128,15 +269,37 @@ class Flat:
         if overwrite_missing or not getattr(self, "rooms", None):
             self.rooms = self._extract_detail(details, "zimmer")
 
-    def _extract_html_value(self, pattern: str) -> str:
-        if not self.raw_html:
-            return ""
-        match = re.search(pattern, self.raw_html, re.IGNORECASE | re.DOTALL)
-        if not match:
+    @staticmethod
+    def _extract_node_value(tree, xpath: etree.XPath) -> str:
+        nodes = xpath(tree)
+        if not nodes:
             return ""
-        value = match.group(1)
-        value = re.sub(r"<br\s*/?>", " ", value, flags=re.IGNORECASE)
-        value = re.sub(r"<[^>]+>", " ", value)
+        return " ".join(" ".join(nodes[0].itertext()).split())
+
+    @classmethod
+    def _scan_html_values(cls, raw_html: str) -> dict[str, str]:
+        values: dict[str, str] = {}
+        for match in _OPEN_TAG_RE.finditer(raw_html):
+            tag = match.group(1).lower()
+            for field, field_tag, class_re in _CLASS_FIELDS:
+                if field in values or field_tag != tag:
+                    continue
+                if not class_re.search(match.group(2)):
+                    continue
+                close = _CLOSE_TAG_RES[tag].search(raw_html, match.end())
+                values[field] = (
+                    cls._clean_html_value(raw_html[match.end() : close.start()])
+                    if close
+                    else ""
+                )
+            if len(values) == len(_CLASS_FIELDS):
+                break
+        return values
+
+    @staticmethod
+    def _clean_html_value(value: str) -> str:
+        value = _BR_RE.sub(" ", value)
+        value = _TAG_RE.sub(" ", value)
         value = html.unescape(value)
         return " ".join(value.replace("\xa0", " ").split())
 
@@ -145,10 +308,9 @@ class Flat:
         label_lower = label.lower()
         for index, token in enumerate(tokens):
             stripped = token.strip()
-            token_lower = stripped.lower()
-            position = token_lower.find(label_lower)
-            if position != -1:
-                remainder = stripped[position + len(label_lower) :].strip(" :")
+            head, sep, _ = stripped.lower().partition(label_lower)
+            if sep:
+                remainder = stripped[len(head) + len(sep) :].strip(" :")
                 if remainder:
                     return remainder
                 if index + 1 < len(tokens):
@@ -156,19 +318,33 @@ class Flat:
         return ""
 
     @staticmethod
-    def _normalize_text(value: str) -> str:
-        cleaned = value.replace("ß", "ss")
+    @functools.lru_cache(maxsize=2048)
+    def _normalize_text(value: str, strict: bool = False) -> str:
+        cleaned = value.translate(_DE_TRANS)
+        if not strict and cleaned.isascii():
+            return cleaned.lower()
         normalized = unicodedata.normalize("NFKD", cleaned)
         normalized = normalized.encode("ascii", "ignore").decode("ascii")
         return normalized.lower()
 
     @staticmethod
     def _parse_zip_city(text: str):
-        match = re.search(r"\b(\d{5})\b\s*(.*)", text)
+        match = _ZIP_RE.search(text)
         if match:
             return match.group(1), match.group(2).strip(), match.start(1)
         return "", "", -1
 
+    @staticmethod
+    def _hash_text(value: str) -> str:
+        # OpenSSL dispatches SHA-256 to SHA-NI (x86-64) or the ARMv8 crypto
+        # extensions; feeding it 64K slices avoids a full-size bytes copy of
+        # listings that embed base64 images.
+        digest = hashlib.sha256()
+        for start in range(0, len(value), _HASH_CHUNK_CHARS):
+            chunk = value[start : start + _HASH_CHUNK_CHARS]
+            digest.update(chunk.encode("utf-8", errors="replace"))
+        return digest.hexdigest()
+
     @staticmethod
     def _looks_like_html(value: str) -> bool:
         return bool(value) and "<" in value and "</" in value
@@ -178,8 +354,8 @@ class Flat:
         if not value:
             return ""
         if Flat._looks_like_html(value):
-            stripped = re.sub(r"<br\s*/?>", "\n", value, flags=re.IGNORECASE)
-            stripped = re.sub(r"<[^>]+>", "\n", stripped)
+            stripped = _BR_RE.sub("\n", value)
+            stripped = _TAG_RE.sub("\n", stripped)
             stripped = html.unescape(stripped)
             return "\n".join(line.strip() for line in stripped.splitlines())
         return value
@@ -196,13 +372,13 @@ class Flat:
             elif len(parts) >= 2:
                 street = ", ".join(parts[:-1])
                 candidate = parts[-1]
-                match = re.search(r"(\d{5})\s+(.*)", candidate)
+                match = _ZIP_CITY_RE.search(candidate)
                 if match:
                     zip_code = match.group(1).strip()
                     city = match.group(2).strip()
                 else:
                     city = candidate
-            match_zip = re.search(r"\b(\d{5})\b\s*(.*)", street)
+            match_zip = _ZIP_RE.search(street)
             if match_zip:
                 zip_code = zip_code or match_zip.group(1).strip()
                 city = city or match_zip.group(2).strip()
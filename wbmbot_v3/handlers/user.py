@@ -1,3 +1,8 @@
+import functools
+
+from wbmbot_v3.utility import misc_operations
+
+
 class User:
     """
     A class to represent a user profile.
@@ -77,6 +82,20 @@ class User:
         self.flat_size_above = self.config.get("flat_size_above", "")
         self.flat_rooms_above = self.config.get("flat_rooms_above", "")
 
+    @functools.cached_property
+    def exclude_pattern(self):
+        """
+        The exclude keywords compiled into one alternation, built on first use.
+        """
+        return misc_operations.compile_filter_keywords(self.exclude)
+
+    @functools.cached_property
+    def normalized_exclude(self):
+        """
+        The exclude keywords stripped and lowercased once, built on first use.
+        """
+        return misc_operations.normalize_filters(self.exclude)
+
     def __str__(self):
         output = ""
         output += f"First Name: {self.first_name}\n"
@@ -6,6 +6,7 @@ from selenium.common.exceptions import (
     NoSuchElementException,
     StaleElementReferenceException,
     TimeoutException,
+    WebDriverException,
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
@@ -17,6 +18,54 @@ __appname__ = os.path.splitext(os.path.basename(__file__))[0]
 color_me = wbm_logger.ColoredLogger(__appname__)
 LOG = color_me.create_logger()
 
+_OUTER_HTML_SCRIPT = "return arguments[0].map((element) => element.outerHTML);"
+
+# Listing page locators
+_FLAT_ROWS = (By.CSS_SELECTOR, ".row.openimmo-search-list-item")
+# Same rows as _FLAT_ROWS, addressed by 1-based document position
+_FLAT_ROW_AT_XPATH = (
+    "(//*[contains(concat(' ', normalize-space(@class), ' '), ' row ')"
+    " and contains(concat(' ', normalize-space(@class), ' '),"
+    " ' openimmo-search-list-item ')])[{position}]"
+)
+_PAGINATION_LIST = (By.XPATH, "//ul[@class='pagination pagination-sm']")
+_PAGE_LINKS = (By.XPATH, ".//a[contains(@class,'pagelink') and not(@data-action)]")
+_ACTIVE_PAGE_LINK = (
+    By.XPATH,
+    ".//li[contains(@class,'active')]/a[contains(@class,'pagelink') and not(@data-action)]",
+)
+_NEXT_PAGE_BUTTON = (By.XPATH, "//a[@title='Nächste Immobilien Seite']")
+# Matches on link text, which CSS cannot express; formatted with a 1-based position
+_ANSEHEN_BUTTON_XPATH = "(//a[@title='Details'][contains(.,'Ansehen')])[{position}]"
+_ACCEPT_COOKIES_BUTTON = (By.XPATH, "//button[@class='cm-btn cm-btn-success']")
+_CLOSE_LIVE_CHAT_BUTTON = (By.XPATH, '//*[@id="removeConvaiseChat"]')
+
+# Application form locators
+_WBS_YES_LABEL = (By.CSS_SELECTOR, "label[for='powermail_field_wbsvorhanden_1']")
+_WBS_NO_LABEL = (By.CSS_SELECTOR, "label[for='powermail_field_wbsvorhanden_2']")
+_WBS_VALID_UNTIL = (By.ID, "powermail_field_wbsgueltigbis")
+_WBS_ROOMS = (By.ID, "powermail_field_wbszimmeranzahl")
+_WBS_INCOME_LIMIT = (
+    By.ID,
+    "powermail_field_einkommensgrenzenacheinkommensbescheinigung9",
+)
+_WBS_SPECIAL_NEEDS_LABEL = (
+    By.CSS_SELECTOR,
+    "label[for='powermail_field_wbsmitbesonderemwohnbedarf_1']",
+)
+_SALUTATION = (By.ID, "powermail_field_anrede")
+_LAST_NAME = (By.ID, "powermail_field_name")
+_FIRST_NAME = (By.ID, "powermail_field_vorname")
+_STREET = (By.ID, "powermail_field_strasse")
+_ZIP_CODE = (By.ID, "powermail_field_plz")
+_CITY = (By.ID, "powermail_field_ort")
+_EMAIL = (By.ID, "powermail_field_e_mail")
+_PHONE = (By.ID, "powermail_field_telefon")
+_PRIVACY_LABEL = (
+    By.CSS_SELECTOR,
+    "label[for='powermail_field_datenschutzhinweis_1']",
+)
+
 
 class LastPageReached(Exception):
     """Raised when pagination has reached the final page in run-once mode."""
@@ -34,14 +83,8 @@ def _get_pagination_state(web_driver) -> tuple[int | None, int | None]:
     Return the current active page number and total number of pages.
     """
 
-    page_list = web_driver.find_element(
-        By.XPATH,
-        "//ul[@class='pagination pagination-sm']",
-    )
-    page_links = page_list.find_elements(
-        By.XPATH,
-        ".//a[contains(@class,'pagelink') and not(@data-action)]",
-    )
+    page_list = web_driver.find_element(*_PAGINATION_LIST)
+    page_links = page_list.find_elements(*_PAGE_LINKS)
     page_numbers = [
         page_number
         for link in page_links
@@ -50,10 +93,7 @@ def _get_pagination_state(web_driver) -> tuple[int | None, int | None]:
     total_pages = max(page_numbers) if page_numbers else None
 
     try:
-        active_link = page_list.find_element(
-            By.XPATH,
-            ".//li[contains(@class,'active')]/a[contains(@class,'pagelink') and not(@data-action)]",
-        )
+        active_link = page_list.find_element(*_ACTIVE_PAGE_LINK)
     except NoSuchElementException:
         active_page = None
     else:
@@ -79,10 +119,7 @@ def next_page(web_driver, current_page: int, terminate_on_last_page: bool = Fals
                 raise LastPageReached()
             return current_page
 
-        next_page_button = web_driver.find_element(
-            By.XPATH,
-            "//a[@title='Nächste Immobilien Seite']",
-        )
+        next_page_button = web_driver.find_element(*_NEXT_PAGE_BUTTON)
 
         if next_page_button:
             target_page = (
@@ -134,12 +171,11 @@ def ansehen_btn(web_driver, flat_element, index: int):
         LOG.info(color_me.cyan("Looking for 'Ansehen' button 🔎"))
         ansehen_button = flat_element.find_element(
             By.XPATH,
-            f"(//a[@title='Details'][contains(.,'Ansehen')])[{index + 1}]",
+            _ANSEHEN_BUTTON_XPATH.format(position=index + 1),
         )
 
         flat_link = ansehen_button.get_attribute("href")
         LOG.info(color_me.green(f"Flat link found: {flat_link} 🎯"))
-        ansehen_button.location_once_scrolled_into_view
         web_driver.get(flat_link)
         return flat_link
     except NoSuchElementException:
@@ -158,70 +194,25 @@ def fill_form(web_driver, user_obj, email: str, test: bool):
         LOG.info(color_me.cyan(f"Filling out form for email address '{email}' 🤖"))
 
         if user_obj.wbs and not test:
-            web_driver.find_element(
-                By.XPATH,
-                "//label[@for='powermail_field_wbsvorhanden_1']",
-            ).click()
-            web_driver.find_element(
-                By.XPATH,
-                "//input[@id='powermail_field_wbsgueltigbis']",
-            ).send_keys(user_obj.wbs_date)
-            web_driver.find_element(
-                By.XPATH,
-                "//select[@id='powermail_field_wbszimmeranzahl']",
-            ).send_keys(user_obj.wbs_rooms)
-            web_driver.find_element(
-                By.XPATH,
-                "//select[@id='powermail_field_einkommensgrenzenacheinkommensbescheinigung9']",
-            ).send_keys(user_obj.wbs_num)
+            web_driver.find_element(*_WBS_YES_LABEL).click()
+            web_driver.find_element(*_WBS_VALID_UNTIL).send_keys(user_obj.wbs_date)
+            web_driver.find_element(*_WBS_ROOMS).send_keys(user_obj.wbs_rooms)
+            web_driver.find_element(*_WBS_INCOME_LIMIT).send_keys(user_obj.wbs_num)
 
             if user_obj.wbs_special_housing_needs:
-                web_driver.find_element(
-                    By.XPATH,
-                    "//label[@for='powermail_field_wbsmitbesonderemwohnbedarf_1']",
-                ).click()
+                web_driver.find_element(*_WBS_SPECIAL_NEEDS_LABEL).click()
         else:
-            web_driver.find_element(
-                By.XPATH,
-                "//label[@for='powermail_field_wbsvorhanden_2']",
-            ).click()
-
-        web_driver.find_element(
-            By.XPATH,
-            "//select[@id='powermail_field_anrede']",
-        ).send_keys(user_obj.sex)
-        web_driver.find_element(
-            By.XPATH,
-            "//input[@id='powermail_field_name']",
-        ).send_keys(user_obj.last_name)
-        web_driver.find_element(
-            By.XPATH,
-            "//input[@id='powermail_field_vorname']",
-        ).send_keys(user_obj.first_name)
-        web_driver.find_element(
-            By.XPATH,
-            "//input[@id='powermail_field_strasse']",
-        ).send_keys(user_obj.street)
-        web_driver.find_element(
-            By.XPATH,
-            "//input[@id='powermail_field_plz']",
-        ).send_keys(user_obj.zip_code)
-        web_driver.find_element(
-            By.XPATH,
-            "//input[@id='powermail_field_ort']",
-        ).send_keys(user_obj.city)
-        web_driver.find_element(
-            By.XPATH,
-            "//input[@id='powermail_field_e_mail']",
-        ).send_keys(email)
-        web_driver.find_element(
-            By.XPATH,
-            "//input[@id='powermail_field_telefon']",
-        ).send_keys(user_obj.phone)
-        web_driver.find_element(
-            By.XPATH,
-            "//label[@for='powermail_field_datenschutzhinweis_1']",
-        ).click()
+            web_driver.find_element(*_WBS_NO_LABEL).click()
+
+        web_driver.find_element(*_SALUTATION).send_keys(user_obj.sex)
+        web_driver.find_element(*_LAST_NAME).send_keys(user_obj.last_name)
+        web_driver.find_element(*_FIRST_NAME).send_keys(user_obj.first_name)
+        web_driver.find_element(*_STREET).send_keys(user_obj.street)
+        web_driver.find_element(*_ZIP_CODE).send_keys(user_obj.zip_code)
+        web_driver.find_element(*_CITY).send_keys(user_obj.city)
+        web_driver.find_element(*_EMAIL).send_keys(email)
+        web_driver.find_element(*_PHONE).send_keys(user_obj.phone)
+        web_driver.find_element(*_PRIVACY_LABEL).click()
 
         if test:
             time.sleep(10)
@@ -235,11 +226,10 @@ def accept_cookies(web_driver) -> bool:
     """
 
     try:
-        accept_button_xpath = "//button[@class='cm-btn cm-btn-success']"
         WebDriverWait(web_driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, accept_button_xpath))
+            EC.element_to_be_clickable(_ACCEPT_COOKIES_BUTTON)
         )
-        web_driver.find_element(By.XPATH, accept_button_xpath).click()
+        web_driver.find_element(*_ACCEPT_COOKIES_BUTTON).click()
         LOG.info(color_me.green("Cookies have been accepted 🍪"))
         return True
     except TimeoutException:
@@ -252,11 +242,10 @@ def close_live_chat_button(web_driver) -> bool:
     """
 
     try:
-        close_button_xpath = '//*[@id="removeConvaiseChat"]'
         WebDriverWait(web_driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, close_button_xpath))
+            EC.element_to_be_clickable(_CLOSE_LIVE_CHAT_BUTTON)
         )
-        web_driver.find_element(By.XPATH, close_button_xpath).click()
+        web_driver.find_element(*_CLOSE_LIVE_CHAT_BUTTON).click()
         return True
     except TimeoutException:
         return False
@@ -281,4 +270,62 @@ def reset_to_start_page(
 def find_flats(web_driver):
     """Find and return all flat listing elements on the current page."""
 
-    return web_driver.find_elements(By.CSS_SELECTOR, ".row.openimmo-search-list-item")
+    return web_driver.find_elements(*_FLAT_ROWS)
+
+
+def get_outer_html(web_driver, elements) -> list[str] | None:
+    """
+    Fetch the outerHTML of all elements in one script call.
+    Returns None when the batch call fails so callers can fall back per element.
+    """
+
+    elements = list(elements)
+    if not elements:
+        return []
+    try:
+        sources = web_driver.execute_script(_OUTER_HTML_SCRIPT, elements)
+    except WebDriverException:
+        return None
+    if not isinstance(sources, list) or len(sources) != len(elements):
+        return None
+    return sources
+
+
+def wait_for_flats(web_driver, minimum: int = 1, timeout: float = 2):
+    """
+    Wait until at least `minimum` flat listings are rendered and return them.
+    Returns whatever is currently on the page once the timeout expires.
+    """
+
+    def _enough_flats(driver):
+        flats = find_flats(driver)
+        return flats if len(flats) >= minimum else False
+
+    try:
+        return WebDriverWait(web_driver, timeout).until(_enough_flats)
+    except TimeoutException:
+        return find_flats(web_driver)
+
+
+def wait_for_flat(web_driver, index: int, timeout: float = 2):
+    """
+    Wait for the listing row at `index` and return it without fetching every row.
+    Returns None when the page no longer has that many listings.
+    """
+
+    locator = (By.XPATH, _FLAT_ROW_AT_XPATH.format(position=index + 1))
+
+    def _flat_row(driver):
+        rows = driver.find_elements(*locator)
+        return rows[0] if rows else False
+
+    # With the driver's implicit wait, every miss would block for that long and
+    # overshoot the timeout, so poll with it disabled
+    implicit_wait = web_driver.timeouts.implicit_wait
+    web_driver.implicitly_wait(0)
+    try:
+        return WebDriverWait(web_driver, timeout).until(_flat_row)
+    except TimeoutException:
+        return None
+    finally:
+        web_driver.implicitly_wait(implicit_wait)
@@ -1,10 +1,14 @@
+import base64
+import binascii
+import functools
+import math
 import os
 import re
 import sys
 import time
 from urllib.parse import urljoin
 
-from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 
@@ -17,7 +21,73 @@ __appname__ = os.path.splitext(os.path.basename(__file__))[0]
 color_me = wbm_logger.ColoredLogger(__appname__)
 LOG = color_me.create_logger()
 
-
+# Seconds between countdown updates; finer ticks are not noticeable on a long wait
+_COUNTDOWN_TICK_SECONDS = 5
+_SANITIZE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+# Checked in priority order: explicit link attributes before bare PDF URLs
+_PDF_LINK_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"href=['\"]([^'\"]+\.pdf[^'\"]*)['\"]",
+        r"data-href=['\"]([^'\"]+\.pdf[^'\"]*)['\"]",
+        r"data-url=['\"]([^'\"]+\.pdf[^'\"]*)['\"]",
+        r"['\"](https?://[^'\"]+\.pdf[^'\"]*)['\"]",
+    )
+)
+
+# Expose link locators, most specific first
+_EXPOSE_SELECTORS = (
+    (By.CSS_SELECTOR, "a.openimmo-detail__intro-expose-button"),
+    (
+        By.XPATH,
+        "//a[contains(@class,'openimmo-detail__intro-expose-button')]",
+    ),
+    (By.XPATH, "//a[contains(@class,'download') and contains(@href,'.pdf')]"),
+    (By.XPATH, "//a[@download and contains(@href,'.pdf')]"),
+    (By.XPATH, "//a[contains(@href,'.pdf') and contains(@class,'btn')]"),
+    (
+        By.XPATH,
+        "//a[contains(@href,'.pdf') and (contains(.,'Expose') or contains(.,'Exposé') or contains(.,'Expos') or contains(.,'Download'))]",
+    ),
+    (By.XPATH, "//a[contains(@href,'expos')]"),
+    (
+        By.XPATH,
+        "//button[contains(@class,'download') and (@data-href or @data-url)]",
+    ),
+)
+# Evaluates the locators in order inside the browser and returns the first link,
+# replacing one find_elements plus three get_attribute round-trips per candidate
+_EXPOSE_LINK_SCRIPT = """
+for (const [by, selector] of arguments[0]) {
+    let nodes = [];
+    try {
+        if (by === "xpath") {
+            const result = document.evaluate(
+                selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            for (let i = 0; i < result.snapshotLength; i++) {
+                nodes.push(result.snapshotItem(i));
+            }
+        } else {
+            nodes = Array.from(document.querySelectorAll(selector));
+        }
+    } catch (error) {
+        continue;
+    }
+    for (const node of nodes) {
+        const link = node.getAttribute("href")
+            || node.getAttribute("data-href")
+            || node.getAttribute("data-url");
+        if (link) {
+            return link;
+        }
+    }
+}
+return null;
+"""
+
+
+@functools.lru_cache(maxsize=4096)
 def _format_delay(seconds: int) -> str:
     if seconds < 60:
         return f"{seconds}s"
@@ -49,21 +119,24 @@ def wait_before_next_application(delay_seconds: int) -> None:
         )
     )
 
-    for remaining in range(delay_seconds, 0, -1):
+    # Sleep against a monotonic deadline so the ticks do not accumulate drift
+    deadline = time.monotonic() + delay_seconds
+    while (remaining := deadline - time.monotonic()) > 0:
         sys.stdout.write(
-            f"\rNext application in {_format_delay(remaining)} ...".ljust(60)
+            f"\rNext application in {_format_delay(math.ceil(remaining))} ...".ljust(60)
         )
         sys.stdout.flush()
-        time.sleep(1)
+        time.sleep(min(_COUNTDOWN_TICK_SECONDS, remaining))
 
     sys.stdout.write("\rNext application starting now!             \n")
     sys.stdout.flush()
 
 
+@functools.lru_cache(maxsize=512)
 def _sanitize_filename(value: str, fallback: str = "snapshot") -> str:
     if not value:
         return fallback
-    sanitized = re.sub(r"[^A-Za-z0-9._-]+", "_", value).strip("._-")
+    sanitized = _SANITIZE_RE.sub("_", value).strip("._-")
     return sanitized or fallback
 
 
@@ -101,70 +174,56 @@ def _extract_pdf_link_from_html(page_source: str, base_url: str) -> str | None:
     if not page_source:
         return None
 
-    patterns = [
-        r"href=['\"]([^'\"]+\.pdf[^'\"]*)['\"]",
-        r"data-href=['\"]([^'\"]+\.pdf[^'\"]*)['\"]",
-        r"data-url=['\"]([^'\"]+\.pdf[^'\"]*)['\"]",
-        r"['\"](https?://[^'\"]+\.pdf[^'\"]*)['\"]",
-    ]
-
-    seen = set()
-    for pattern in patterns:
-        for match in re.findall(pattern, page_source, flags=re.IGNORECASE):
-            if not match:
-                continue
-            candidate = match.strip()
-            if candidate in seen:
-                continue
-            seen.add(candidate)
-            return urljoin(base_url, candidate)
+    for pattern in _PDF_LINK_PATTERNS:
+        match = pattern.search(page_source)
+        if match:
+            return urljoin(base_url, match.group(1).strip())
 
     return None
 
 
-def _find_expose_download_link(web_driver):
-    selectors = [
-        (By.CSS_SELECTOR, "a.openimmo-detail__intro-expose-button"),
-        (
-            By.XPATH,
-            "//a[contains(@class,'openimmo-detail__intro-expose-button')]",
-        ),
-        (By.XPATH, "//a[contains(@class,'download') and contains(@href,'.pdf')]"),
-        (By.XPATH, "//a[@download and contains(@href,'.pdf')]"),
-        (By.XPATH, "//a[contains(@href,'.pdf') and contains(@class,'btn')]"),
-        (
-            By.XPATH,
-            "//a[contains(@href,'.pdf') and (contains(.,'Expose') or contains(.,'Exposé') or contains(.,'Expos') or contains(.,'Download'))]",
-        ),
-        (By.XPATH, "//a[contains(@href,'expos')]"),
-        (
-            By.XPATH,
-            "//button[contains(@class,'download') and (@data-href or @data-url)]",
-        ),
-    ]
-
-    for by, selector in selectors:
-        try:
-            elements = web_driver.find_elements(by, selector)
-        except Exception:
-            continue
-
-        for element in elements:
-            try:
-                link = (
-                    element.get_attribute("href")
-                    or element.get_attribute("data-href")
-                    or element.get_attribute("data-url")
-                )
-            except StaleElementReferenceException:
-                continue
+def _find_expose_download_link_dom(web_driver) -> str | None:
+    try:
+        link = web_driver.execute_script(
+            _EXPOSE_LINK_SCRIPT, [list(selector) for selector in _EXPOSE_SELECTORS]
+        )
+    except WebDriverException:
+        return None
 
-            if link:
-                return urljoin(web_driver.current_url, link)
+    return urljoin(web_driver.current_url, link) if link else None
 
+
+def _find_expose_download_link_html(web_driver) -> str | None:
+    # Transfers the whole page source, so keep this out of polling loops
     return _extract_pdf_link_from_html(web_driver.page_source, web_driver.current_url)
 
 
+def _find_expose_download_link(web_driver):
+    link = _find_expose_download_link_dom(web_driver)
+    return link or _find_expose_download_link_html(web_driver)
+
+
+def _print_page_to_pdf(web_driver, local_dir: str, name: str) -> str | None:
+    """
+    Render the current page to a PDF through Chrome DevTools, reusing the
+    browser's session instead of opening a new HTTP connection.
+    """
+
+    try:
+        result = web_driver.execute_cdp_cmd(
+            "Page.printToPDF", {"printBackground": True}
+        )
+        pdf_bytes = base64.b64decode(result["data"])
+    except (AttributeError, KeyError, TypeError, binascii.Error, WebDriverException):
+        return None
+
+    io_operations.create_directory_if_not_exists(local_dir)
+    pdf_path = os.path.join(local_dir, f"{_sanitize_filename(name, 'expose')}.pdf")
+    with open(pdf_path, "wb") as pdf_file:
+        pdf_file.write(pdf_bytes)
+    return pdf_path
+
+
 def download_expose_as_pdf(
     web_driver,
     flat_name: str,
@@ -188,12 +247,30 @@ def download_expose_as_pdf(
     download_link = None
     try:
         download_link = WebDriverWait(web_driver, 5).until(
-            lambda driver: _find_expose_download_link(driver)
+            _find_expose_download_link_dom
         )
     except TimeoutException:
-        download_link = _find_expose_download_link(web_driver)
+        download_link = _find_expose_download_link_html(web_driver)
 
-    if not download_link:
+    pdf_dir = os.path.join(
+        runtime_paths.offline_apartment_path, runtime_paths.run_label
+    )
+    pdf_path = None
+    if download_link:
+        pdf_path = hpd.download_pdf_file(download_link, pdf_dir)
+        if not pdf_path:
+            if debug_dir:
+                _debug_dump_page(
+                    web_driver,
+                    debug_dir,
+                    f"details_failed_download_{flat_name}",
+                )
+            LOG.warning(
+                color_me.yellow(
+                    f"Expose download failed for '{flat_name}'. Printing the details page instead. 🚧"
+                )
+            )
+    else:
         if debug_dir:
             _debug_dump_page(
                 web_driver,
@@ -202,27 +279,17 @@ def download_expose_as_pdf(
             )
         LOG.warning(
             color_me.yellow(
-                f"Expose download link not found for '{flat_name}'. Continuing without PDF. 🚧"
+                f"Expose download link not found for '{flat_name}'. Printing the details page instead. 🚧"
             )
         )
-        return None
-
-    pdf_path = hpd.download_pdf_file(
-        download_link,
-        os.path.join(runtime_paths.offline_apartment_path, runtime_paths.run_label),
-    )
 
     if not pdf_path:
-        if debug_dir:
-            _debug_dump_page(
-                web_driver,
-                debug_dir,
-                f"details_failed_download_{flat_name}",
-            )
-        LOG.warning(
-            color_me.yellow(
-                f"Expose download failed for '{flat_name}'. Continuing without PDF. 🚧"
+        pdf_path = _print_page_to_pdf(web_driver, pdf_dir, flat_name)
+        if not pdf_path:
+            LOG.warning(
+                color_me.yellow(
+                    f"Could not save a PDF for '{flat_name}'. Continuing without PDF. 🚧"
+                )
             )
-        )
 
     return pdf_path
@@ -1,5 +1,7 @@
 import os
 import time
+from dataclasses import dataclass
+from operator import attrgetter
 
 from selenium.webdriver.common.by import By
 
@@ -13,37 +15,67 @@ __appname__ = os.path.splitext(os.path.basename(__file__))[0]
 color_me = wbm_logger.ColoredLogger(__appname__)
 LOG = color_me.create_logger()
 
+_SUBMIT_BUTTON = (By.XPATH, "//button[@type='submit']")
 
-def sort_flats_by_rent(flat_elements, test: bool):
+# Logged for every flat on every refresh, so color once and format lazily
+_ALREADY_APPLIED = color_me.yellow("Oops, we already applied for flat: %s 🚫")
+_IGNORING_FLAT = color_me.yellow("Ignoring flat '%s' because %s 🙈")
+_SENIORS_ONLY = color_me.yellow(
+    "Ignoring flat: %s because it is for Seniors only ('seniorenwohnungen') 🙈"
+)
+
+
+@dataclass(slots=True)
+class SortedFlatEntry:
+    index: int
+    rent_key: float
+    display_rent: str
+    title: str
+    title_key: str
+    flat: flat.Flat
+    metrics: eligibility.FlatMetrics
+
+
+def _element_source(element) -> str:
+    try:
+        return element.get_attribute("outerHTML")
+    except Exception:
+        return element.text
+
+
+def sort_flats_by_rent(flat_elements, test: bool, web_driver=None):
     """
     Return metadata about flats sorted by lowest rent first.
+    With a web_driver, all listing sources are fetched in a single round-trip.
     """
 
+    flat_sources = (
+        browser_actions.get_outer_html(web_driver, flat_elements)
+        if web_driver is not None
+        else None
+    )
+    if flat_sources is None:
+        flat_sources = [_element_source(element) for element in flat_elements]
+
     sorted_entries = []
-    for index, element in enumerate(flat_elements):
-        try:
-            flat_source = element.get_attribute("outerHTML")
-        except Exception:
-            flat_source = element.text
-        flat_obj = flat.Flat(flat_source, test)
-        rent_value = misc_operations.convert_rent(flat_obj.total_rent)
+    for index, flat_obj in enumerate(flat.Flat.parse_batch(flat_sources, test)):
+        metrics = eligibility.measure_flat(flat_obj)
+        rent_value = metrics.rent
         rent_key = rent_value if isinstance(rent_value, (int, float)) else float("inf")
+        title = flat_obj.title or f"Flat #{index + 1}"
         sorted_entries.append(
-            {
-                "index": index,
-                "rent_key": rent_key,
-                "display_rent": flat_obj.total_rent or "unknown",
-                "title": flat_obj.title or f"Flat #{index + 1}",
-                "flat": flat_obj,
-            }
+            SortedFlatEntry(
+                index=index,
+                rent_key=rent_key,
+                display_rent=flat_obj.total_rent or "unknown",
+                title=title,
+                title_key=title.lower(),
+                flat=flat_obj,
+                metrics=metrics,
+            )
         )
 
-    sorted_entries.sort(
-        key=lambda entry: (
-            entry["rent_key"],
-            entry["title"].lower() if entry["title"] else "",
-        )
-    )
+    sorted_entries.sort(key=attrgetter("rent_key", "title_key"))
     return sorted_entries
 
 
@@ -74,8 +106,7 @@ def apply_to_flat(
             f"details_loaded_{flat_title}",
         )
 
-    browser_actions.fill_form(web_driver, user_profile, email, test)
-
+    # Saved before the form is filled so the PDF holds no applicant data
     pdf_path = None
     if not test and debug_dir:
         try:
@@ -92,8 +123,10 @@ def apply_to_flat(
                 )
             )
 
+    browser_actions.fill_form(web_driver, user_profile, email, test)
+
     if not test:
-        web_driver.find_element(By.XPATH, "//button[@type='submit']").click()
+        web_driver.find_element(*_SUBMIT_BUTTON).click()
 
     if not test and user_profile.notifications_email:
         notifications.send_email_notification(
@@ -183,10 +216,10 @@ def process_flats(
             )
 
         restart_processing = False
-        sorted_entries = sort_flats_by_rent(all_flats, test)
+        sorted_entries = sort_flats_by_rent(all_flats, test, web_driver)
         if sorted_entries:
             preview = ", ".join(
-                f"{entry['title']} ({entry['display_rent']})"
+                f"{entry.title} ({entry.display_rent})"
                 for entry in sorted_entries[:3]
             )
             LOG.info(
@@ -197,11 +230,9 @@ def process_flats(
             )
 
         for position, entry in enumerate(sorted_entries):
-            time.sleep(2)
-
-            all_flats = browser_actions.find_flats(web_driver)
-            flat_index = entry["index"]
-            if flat_index >= len(all_flats):
+            flat_index = entry.index
+            flat_elem = browser_actions.wait_for_flat(web_driver, flat_index)
+            if flat_elem is None:
                 LOG.warning(
                     color_me.yellow(
                         "Flat list changed while iterating; restarting processing loop 🔄"
@@ -209,46 +240,44 @@ def process_flats(
                 )
                 restart_processing = True
                 break
-            flat_elem = all_flats[flat_index]
-            flat_obj = entry.get("flat")
-            if not flat_obj:
-                try:
-                    flat_source = flat_elem.get_attribute("outerHTML")
-                except Exception:
-                    flat_source = flat_elem.text
-                flat_obj = flat.Flat(flat_source, test)
-                entry["flat"] = flat_obj
+            flat_obj = entry.flat
 
             if test:
                 LOG.info(color_me.magenta(f"Flat Element: {flat_elem.text}"))
                 LOG.info(color_me.magenta(f"Flat Obj: {flat_obj}"))
 
+            # One bulk lookup covers every email of every profile for this flat
+            candidates = [
+                (email, flat_obj)
+                for user_profile in user_profiles
+                for email in getattr(user_profile, "emails", None) or []
+            ]
+            if candidates and application_store is None:
+                raise RuntimeError("Application store is not configured.")
+            applied_keys = (
+                application_store.applied_keys(candidates) if candidates else set()
+            )
+
             for user_profile in user_profiles:
                 if not getattr(user_profile, "emails", None):
                     continue
+                # Eligibility only depends on the flat and profile, not the email
+                decision = None
                 for email in user_profile.emails:
-                    if application_store is None:
-                        raise RuntimeError("Application store is not configured.")
-
-                    if application_store.has_applied(email, flat_obj):
-                        LOG.warning(
-                            color_me.yellow(
-                                f"Oops, we already applied for flat: {flat_obj.title} 🚫"
-                            )
-                        )
+                    if (email, flat_obj.hash) in applied_keys:
+                        LOG.warning(_ALREADY_APPLIED, flat_obj.title)
                         continue
 
-                    is_eligible, reason = eligibility.evaluate_flat_eligibility(
-                        flat_elem,
-                        flat_obj,
-                        user_profile,
-                    )
-                    if not is_eligible:
-                        LOG.warning(
-                            color_me.yellow(
-                                f"Ignoring flat '{flat_obj.title}' because {reason} 🙈"
-                            )
+                    if decision is None:
+                        decision = eligibility.evaluate_flat_eligibility(
+                            flat_elem,
+                            flat_obj,
+                            user_profile,
+                            metrics=entry.metrics,
                         )
+                    is_eligible, reason = decision
+                    if not is_eligible:
+                        LOG.warning(_IGNORING_FLAT, flat_obj.title, reason)
                         continue
 
                     applied = apply_to_flat(
@@ -274,15 +303,11 @@ def process_flats(
                             application_delay_seconds
                         )
                         web_driver.get(start_url)
-                        time.sleep(1.5)
+                        browser_actions.wait_for_flats(web_driver)
                         restart_processing = True
                         break
 
-                    LOG.warning(
-                        color_me.yellow(
-                            f"Ignoring flat: {flat_obj.title} because it is for Seniors only ('seniorenwohnungen') 🙈"
-                        )
-                    )
+                    LOG.warning(_SENIORS_ONLY, flat_obj.title)
 
                 if restart_processing:
                     break
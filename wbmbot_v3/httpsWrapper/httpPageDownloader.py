@@ -2,9 +2,6 @@ import logging
 import os
 import warnings
 
-import requests
-from pywebcopy import save_webpage
-
 from wbmbot_v3.utility import io_operations
 
 # Suppress PyWebCopy's logging
@@ -27,6 +24,9 @@ def save_viewing_offline(url: str, save_path: str, name: str):
     Save a WBM viewing (if found) as an offline HTML file
     """
 
+    # pywebcopy is heavy and only needed here, so import it on first use
+    from pywebcopy import save_webpage
+
     # Download the webpage
     save_webpage(
         url=url,
@@ -67,6 +67,9 @@ def download_pdf_file(url: str, local_dir: str) -> str | None:
     Returns:
         None
     """
+    # requests pulls in urllib3/ssl; only pay for it when a PDF is downloaded
+    import requests
+
     try:
         response = requests.get(url)
         response.raise_for_status()  # Raise exception if response is not OK
@@ -1,19 +1,13 @@
 import argparse
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Sequence
+from urllib.parse import urlsplit
 
-from wbmbot_v3.chromeDriver import chrome_driver_configurator as cdc
-from wbmbot_v3.handlers import user
-from wbmbot_v3.helpers import constants, webDriverOperations
+from wbmbot_v3.helpers import constants
 from wbmbot_v3.logger import wbm_logger
-from wbmbot_v3.utility import io_operations, misc_operations
-from wbmbot_v3.utility.application_store import (
-    CompositeApplicationStore,
-    FirestoreApplicationStore,
-    build_application_store,
-)
-from wbmbot_v3.utility.config_store import build_config_store
 
 __appname__ = os.path.splitext(os.path.basename(__file__))[0]
 
@@ -32,6 +26,40 @@ def _env_bool(name: str, fallback: bool = False) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
+@dataclass(frozen=True)
+class EnvDefaults:
+    firestore_project_id: str | None
+    firestore_collection: str | None
+    firestore_config_collection: str | None
+    credentials_path: str | None
+    firestore_database: str | None
+    firestore_legacy_lookup: bool
+    wbm_user_id: str | None
+    github_actions: bool
+    github_actions_collection: str
+
+
+def _env_snapshot() -> EnvDefaults:
+    """
+    Read the environment variables the bot falls back on once, at startup.
+    """
+
+    environ = os.environ
+    return EnvDefaults(
+        firestore_project_id=environ.get("FIRESTORE_PROJECT_ID"),
+        firestore_collection=environ.get("FIRESTORE_COLLECTION"),
+        firestore_config_collection=environ.get("FIRESTORE_CONFIG_COLLECTION"),
+        credentials_path=environ.get("GOOGLE_APPLICATION_CREDENTIALS"),
+        firestore_database=environ.get("FIRESTORE_DATABASE"),
+        firestore_legacy_lookup=_env_bool("FIRESTORE_LEGACY_LOOKUP", True),
+        wbm_user_id=environ.get("WBM_USER_ID"),
+        github_actions=environ.get("GITHUB_ACTIONS", "").strip().lower() == "true",
+        github_actions_collection=environ.get(
+            "FIRESTORE_GITHUB_ACTIONS_COLLECTION", "wbm_applications_github_actions"
+        ),
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     """
     Parse the command line arguments
@@ -42,6 +70,7 @@ def build_parser() -> argparse.ArgumentParser:
     )
     default_config_store = _env_choice("CONFIG_STORE", {"file", "firestore"}, "file")
     default_debug = _env_bool("WBM_DEBUG", False)
+    default_background_writes = _env_bool("FIRESTORE_BACKGROUND_WRITES", False)
 
     parser = argparse.ArgumentParser(
         prog="python -m wbmbot_v3",
@@ -160,6 +189,17 @@ def build_parser() -> argparse.ArgumentParser:
         required=False,
         help="Firestore database ID (overrides FIRESTORE_DATABASE).",
     )
+    parser.add_argument(
+        "--firestore-background-writes",
+        dest="firestore_background_writes",
+        action=argparse.BooleanOptionalAction,
+        default=default_background_writes,
+        required=False,
+        help=(
+            "Record Firestore applications on a background thread instead of "
+            "blocking (default: false). Can also set FIRESTORE_BACKGROUND_WRITES."
+        ),
+    )
     parser.add_argument(
         "--debug",
         dest="debug",
@@ -186,7 +226,25 @@ def main(argv: Sequence[str] | None = None) -> int:
     wbm_logger.configure_logging()
 
     args = parse_args(argv)
+
+    # Selenium, webdriver-manager and requests dominate startup time; import them
+    # here so `--help` and argument errors do not pay for them
+    from wbmbot_v3.chromeDriver import chrome_driver_configurator as cdc
+    from wbmbot_v3.handlers import user
+    from wbmbot_v3.helpers import webDriverOperations
+    from wbmbot_v3.utility import io_operations, misc_operations
+    from wbmbot_v3.utility.application_store import (
+        FirestoreApplicationStore,
+        build_application_store,
+        build_composite_store,
+    )
+    from wbmbot_v3.utility.config_store import build_config_store
+
     runtime_paths = constants.build_runtime_paths()
+    env = _env_snapshot()
+    firestore_project_id = args.firestore_project_id or env.firestore_project_id
+    firestore_credentials = args.firestore_credentials or env.credentials_path
+    firestore_database = args.firestore_database or env.firestore_database
 
     color_me = wbm_logger.ColoredLogger(__appname__)
     LOG = color_me.create_logger()
@@ -212,15 +270,23 @@ def main(argv: Sequence[str] | None = None) -> int:
         )
     )
     LOG.info(color_me.cyan("Checking for internet connection 🔎"))
-    while True:
-        if not misc_operations.check_internet_connection():
-            LOG.error(
-                color_me.red("No internet connection found. Retrying in 10 seconds ⚠️")
+    # A DNS lookup of the WBM host is enough to tell whether we are online; test
+    # runs never reach wbm.de, so they keep the plain HTTPS check
+    wbm_host = urlsplit(constants.wbm_url).hostname or "www.wbm.de"
+    retry_delay = 1.0
+    while not (
+        misc_operations.check_internet_connection()
+        if args.test
+        else misc_operations.resolve_host(wbm_host)
+    ):
+        LOG.error(
+            color_me.red(
+                f"No internet connection found. Retrying in {retry_delay:g} seconds ⚠️"
             )
-            time.sleep(10)
-        else:
-            LOG.info(color_me.green("Online 🟢"))
-            break
+        )
+        time.sleep(retry_delay)
+        retry_delay = min(retry_delay * 2, 30.0)
+    LOG.info(color_me.green("Online 🟢"))
 
     LOG.info(
         color_me.cyan(
@@ -246,15 +312,49 @@ def main(argv: Sequence[str] | None = None) -> int:
             else runtime_paths.wbm_test_config_name
         ),
         allow_prompt=not args.run_once,
-        project_id=args.firestore_project_id or os.environ.get("FIRESTORE_PROJECT_ID"),
-        collection=args.firestore_config_collection
-        or os.environ.get("FIRESTORE_CONFIG_COLLECTION"),
-        credentials_path=args.firestore_credentials
-        or os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"),
-        database=args.firestore_database or os.environ.get("FIRESTORE_DATABASE"),
+        project_id=firestore_project_id,
+        collection=args.firestore_config_collection or env.firestore_config_collection,
+        credentials_path=firestore_credentials,
+        database=firestore_database,
+    )
+    application_store = build_application_store(
+        args.applications_store,
+        runtime_paths.log_file_path,
+        project_id=firestore_project_id,
+        collection=args.firestore_collection or env.firestore_collection,
+        credentials_path=firestore_credentials,
+        database=firestore_database,
+        legacy_lookup=env.firestore_legacy_lookup,
+        background_writes=args.firestore_background_writes,
     )
-    config_store.initialize()
-    config_key = args.config_key or os.environ.get("WBM_USER_ID")
+    if env.github_actions:
+        audit_store = FirestoreApplicationStore(
+            project_id=firestore_project_id,
+            collection=env.github_actions_collection,
+            credentials_path=firestore_credentials,
+            database=firestore_database,
+            legacy_lookup=env.firestore_legacy_lookup,
+            background_writes=args.firestore_background_writes,
+        )
+        # The audit store is not a cache of the primary one, so never back-fill
+        application_store = build_composite_store(
+            [application_store, audit_store],
+            label="primary+github-actions",
+            cache_fill=False,
+        )
+    if args.config_store == "firestore":
+        # Neither store depends on the other, so overlap their Firestore setup
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pending = [
+                executor.submit(config_store.initialize),
+                executor.submit(application_store.initialize),
+            ]
+            for future in pending:
+                future.result()
+    else:
+        # The file config store may prompt, so it runs before anything else
+        config_store.initialize()
+    config_key = args.config_key or env.wbm_user_id
     if args.config_store == "firestore" and config_key:
         configs = [config_store.load_config(config_key)]
     else:
@@ -267,32 +367,8 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     # Create User Profiles
     user_profiles = [user.User(cfg) for cfg in configs]
-    application_store = build_application_store(
-        args.applications_store,
-        runtime_paths.log_file_path,
-        project_id=args.firestore_project_id or os.environ.get("FIRESTORE_PROJECT_ID"),
-        collection=args.firestore_collection or os.environ.get("FIRESTORE_COLLECTION"),
-        credentials_path=args.firestore_credentials
-        or os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"),
-        database=args.firestore_database or os.environ.get("FIRESTORE_DATABASE"),
-    )
-    if os.environ.get("GITHUB_ACTIONS", "").strip().lower() == "true":
-        audit_collection = os.environ.get(
-            "FIRESTORE_GITHUB_ACTIONS_COLLECTION",
-            "wbm_applications_github_actions",
-        )
-        audit_store = FirestoreApplicationStore(
-            project_id=args.firestore_project_id
-            or os.environ.get("FIRESTORE_PROJECT_ID"),
-            collection=audit_collection,
-            credentials_path=args.firestore_credentials
-            or os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"),
-            database=args.firestore_database or os.environ.get("FIRESTORE_DATABASE"),
-        )
-        application_store = CompositeApplicationStore(
-            [application_store, audit_store], label="primary+github-actions"
-    )
-    application_store.initialize()
+    if args.config_store != "firestore":
+        application_store.initialize()
     # Get URL
     start_url = constants.wbm_url if not args.test else runtime_paths.test_wbm_url
 
@@ -302,42 +378,60 @@ def main(argv: Sequence[str] | None = None) -> int:
     page_changed = False
     LOG.info(color_me.cyan(f"Connecting to '{start_url}' 🔗"))
 
-    while True:
-        chrome_driver_instance = cdc.ChromeDriverConfigurator(args.headless, args.test)
-        web_driver = chrome_driver_instance.get_driver()
+    # Chrome startup takes seconds, so the driver is only recycled after a crash
+    web_driver = cdc.ChromeDriverConfigurator(args.headless, args.test).get_driver()
+    succeeded = False
+    try:
+        while True:
+            try:
+                webDriverOperations.process_flats(
+                    web_driver,
+                    user_profiles,
+                    start_url,
+                    current_page,
+                    previous_page,
+                    page_changed,
+                    args.interval,
+                    args.test,
+                    application_delay_seconds,
+                    args.run_once,
+                    args.exit_on_last_page,
+                    application_store,
+                    debug_dir,
+                    runtime_paths=runtime_paths,
+                )
+                if args.run_once or args.exit_on_last_page:
+                    break
+            except Exception as e:
+                LOG.error(
+                    color_me.red("Bot has crashed... Attempting to restart it now! ❤️‍🩹")
+                )
+                LOG.error(color_me.red(f"Crash reason: {e}"))
+                if args.run_once:
+                    raise
+                try:
+                    web_driver.quit()
+                except Exception:
+                    pass
+                # Wait for a few seconds before restarting
+                time.sleep(5)
+                web_driver = cdc.ChromeDriverConfigurator(
+                    args.headless, args.test
+                ).get_driver()
+        succeeded = True
+    finally:
         try:
-            webDriverOperations.process_flats(
-                web_driver,
-                user_profiles,
-                start_url,
-                current_page,
-                previous_page,
-                page_changed,
-                args.interval,
-                args.test,
-                application_delay_seconds,
-                args.run_once,
-                args.exit_on_last_page,
-                application_store,
-                debug_dir,
-                runtime_paths=runtime_paths,
-            )
-            if args.run_once or args.exit_on_last_page:
-                break
-        except Exception as e:
-            LOG.error(
-                color_me.red("Bot has crashed... Attempting to restart it now! ❤️‍🩹")
-            )
-            LOG.error(color_me.red(f"Crash reason: {e}"))
-            if args.run_once:
+            web_driver.quit()
+        except Exception:
+            pass
+        # Queued application writes must land before exit or the next run re-applies
+        try:
+            application_store.flush()
+        except Exception as exc:
+            LOG.error(color_me.red(f"Failed to record queued applications: {exc}"))
+            # Fail the run, unless a crash is already propagating with its own cause
+            if succeeded:
                 raise
-            # Wait for a few seconds before restarting
-            time.sleep(5)
-        finally:
-            try:
-                web_driver.quit()
-            except Exception:
-                pass
     return 0
 
 
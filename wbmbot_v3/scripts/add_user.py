@@ -1,26 +1,23 @@
 #!/usr/bin/env python3
 
 import argparse
-import json
 import os
 import sys
 
+from wbmbot_v3.utility import json_support
 from wbmbot_v3.utility.config_store import FirestoreConfigStore
 
 
 def _resolve_user_id(config: dict, explicit: str | None) -> str | None:
     if explicit:
         return explicit
-    env_user = os.getenv("WBM_USER_ID")
-    if env_user:
+    if env_user := os.getenv("WBM_USER_ID"):
         return env_user
-    if config.get("user_id"):
-        return config.get("user_id")
-    notifications = (config.get("notifications_email") or "").strip()
-    if notifications:
+    if user_id := config.get("user_id"):
+        return user_id
+    if notifications := (config.get("notifications_email") or "").strip():
         return notifications
-    emails = config.get("emails") or []
-    if emails:
+    if emails := config.get("emails"):
         return str(emails[0]).strip()
     return None
 
@@ -66,8 +63,8 @@ def main() -> int:
 
     args = parser.parse_args()
 
-    with open(args.path, "r", encoding="utf-8") as config_file:
-        config = json.load(config_file)
+    with open(args.path, "rb") as config_file:
+        config = json_support.loads(config_file.read())
 
     user_id = _resolve_user_id(config, args.user_id)
     if not user_id:
@@ -1,7 +1,11 @@
+import functools
 import hashlib
 import os
+import queue
+import threading
 from abc import ABC, abstractmethod
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
 
 from wbmbot_v3.helpers import constants
 from wbmbot_v3.logger import wbm_logger
@@ -11,6 +15,28 @@ __appname__ = os.path.splitext(os.path.basename(__file__))[0]
 color_me = wbm_logger.ColoredLogger(__appname__)
 LOG = color_me.create_logger()
 
+# Colored once; the arguments are only interpolated when the record is emitted
+_STORE_READ_FAILED = color_me.red("Application store read failed (%s): %s")
+_STORE_WRITE_FAILED = color_me.red("Application store write failed (%s): %s")
+_USING_COMPOSITE_STORE = color_me.cyan(
+    "Using composite application store (%s, stores=%d) 🧩"
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _hashed_doc_id(normalized_email: str, flat_hash: str) -> str:
+    # Document IDs only need to be unique, not collision resistant
+    digest = hashlib.blake2b(
+        f"{normalized_email}|{flat_hash}".encode("utf-8"), digest_size=16
+    )
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _legacy_hashed_doc_id(normalized_email: str, flat_hash: str) -> str:
+    digest = hashlib.sha256(f"{normalized_email}|{flat_hash}".encode("utf-8"))
+    return digest.hexdigest()
+
 
 class ApplicationStore(ABC):
     def initialize(self) -> None:
@@ -24,60 +50,202 @@ class ApplicationStore(ABC):
     def record_application(self, email: str, flat_obj) -> None:
         raise NotImplementedError
 
+    def record_applications(self, items: Iterable[tuple[str, Any]]) -> None:
+        for email, flat_obj in items:
+            self.record_application(email, flat_obj)
+
+    def flush(self) -> None:
+        """
+        Wait until every write issued so far has been persisted.
+        """
+
+        return None
+
+    def remember_applied(self, items: Iterable[tuple[str, Any]]) -> None:
+        """
+        Mark items as applied in memory only, without persisting anything.
+        """
+
+        return None
+
+    def applied_keys(self, items: Iterable[tuple[str, Any]]) -> set[tuple[str, str]]:
+        """
+        Return the (email, flat hash) pairs among items that were already applied to.
+        Backends override this to answer the whole batch in one lookup.
+        """
+
+        return {
+            (email, flat_obj.hash)
+            for email, flat_obj in items
+            if self.has_applied(email, flat_obj)
+        }
+
 
 class CompositeApplicationStore(ApplicationStore):
-    def __init__(self, stores, label: str | None = None):
+    """
+    Fan writes out to every store and answer reads from the first store that
+    knows the application. Stores are ordered fastest first; with cache_fill a
+    hit in a later store is remembered in memory by the earlier ones, so
+    repeated checks are answered locally without writing records they never made.
+    """
+
+    def __init__(self, stores, label: str | None = None, cache_fill: bool = True):
         self.stores = [store for store in (stores or []) if store]
         self.label = label or "composite"
+        self.cache_fill = cache_fill
 
     def initialize(self) -> None:
         for store in self.stores:
             store.initialize()
-        LOG.info(
-            color_me.cyan(
-                f"Using composite application store ({self.label}, stores={len(self.stores)}) 🧩"
-            )
-        )
+        LOG.info(_USING_COMPOSITE_STORE, self.label, len(self.stores))
 
-    def has_applied(self, email: str, flat_obj) -> bool:
+    def flush(self) -> None:
+        # Flush every store even if an earlier one fails, then report the failure
+        error: Exception | None = None
         for store in self.stores:
+            try:
+                store.flush()
+            except Exception as exc:
+                LOG.error(_STORE_WRITE_FAILED, type(store).__name__, exc)
+                error = error or exc
+        if error is not None:
+            raise error
+
+    def _fill_earlier_stores(self, position: int, items: list[tuple[str, Any]]) -> None:
+        if not self.cache_fill or not items:
+            return
+        for store in self.stores[:position]:
+            store.remember_applied(items)
+
+    def has_applied(self, email: str, flat_obj) -> bool:
+        for position, store in enumerate(self.stores):
             try:
                 if store.has_applied(email, flat_obj):
+                    self._fill_earlier_stores(position, [(email, flat_obj)])
                     return True
             except Exception as exc:
-                LOG.error(
-                    color_me.red(
-                        f"Application store read failed ({type(store).__name__}): {exc}"
-                    )
-                )
+                LOG.error(_STORE_READ_FAILED, type(store).__name__, exc)
         return False
 
+    def applied_keys(self, items: Iterable[tuple[str, Any]]) -> set[tuple[str, str]]:
+        items = list(items)
+        applied: set[tuple[str, str]] = set()
+        for position, store in enumerate(self.stores):
+            pending = [
+                (email, flat_obj)
+                for email, flat_obj in items
+                if (email, flat_obj.hash) not in applied
+            ]
+            if not pending:
+                break
+            try:
+                found = store.applied_keys(pending)
+            except Exception as exc:
+                LOG.error(_STORE_READ_FAILED, type(store).__name__, exc)
+                continue
+            applied |= found
+            self._fill_earlier_stores(
+                position,
+                [
+                    (email, flat_obj)
+                    for email, flat_obj in pending
+                    if (email, flat_obj.hash) in found
+                ],
+            )
+        return applied
+
+    def remember_applied(self, items: Iterable[tuple[str, Any]]) -> None:
+        items = list(items)
+        for store in self.stores:
+            store.remember_applied(items)
+
     def record_application(self, email: str, flat_obj) -> None:
         for store in self.stores:
             try:
                 store.record_application(email, flat_obj)
             except Exception as exc:
-                LOG.error(
-                    color_me.red(
-                        f"Application store write failed ({type(store).__name__}): {exc}"
-                    )
-                )
+                LOG.error(_STORE_WRITE_FAILED, type(store).__name__, exc)
+
+    def record_applications(self, items: Iterable[tuple[str, Any]]) -> None:
+        items = list(items)
+        for store in self.stores:
+            try:
+                store.record_applications(items)
+            except Exception as exc:
+                LOG.error(_STORE_WRITE_FAILED, type(store).__name__, exc)
 
 
 class FileApplicationStore(ApplicationStore):
     def __init__(self, log_file_path: str):
         self.log_file_path = log_file_path
+        self._applied: set[tuple[str, str]] | None = None
+        self._log_mtime_ns: int | None = None
 
     def initialize(self) -> None:
         io_operations.initialize_application_logger(self.log_file_path)
+        self._applied = self._load_index()
+
+    def _current_mtime_ns(self) -> int | None:
+        try:
+            return os.stat(self.log_file_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_index(self) -> set[tuple[str, str]]:
+        self._log_mtime_ns = self._current_mtime_ns()
+        log = io_operations.load_application_log(self.log_file_path)
+        return {
+            (email, flat_hash)
+            for email, entries in log.items()
+            if isinstance(entries, dict)
+            for flat_hash in entries
+        }
+
+    def _index(self) -> set[tuple[str, str]]:
+        if self._applied is None:
+            self._applied = self._load_index()
+        return self._applied
+
+    def _reload_if_changed(self) -> set[tuple[str, str]]:
+        # Only re-read the log when another process has written to it since
+        if self._current_mtime_ns() != self._log_mtime_ns:
+            self._applied = self._load_index()
+        return self._index()
 
     def has_applied(self, email: str, flat_obj) -> bool:
-        return io_operations.check_flat_already_applied(
-            self.log_file_path, email, flat_obj
-        )
+        key = (email.strip(), flat_obj.hash)
+        return key in self._index() or key in self._reload_if_changed()
+
+    def applied_keys(self, items: Iterable[tuple[str, Any]]) -> set[tuple[str, str]]:
+        items = list(items)
+        index = self._index()
+        if any(
+            (email.strip(), flat_obj.hash) not in index for email, flat_obj in items
+        ):
+            index = self._reload_if_changed()
+        return {
+            (email, flat_obj.hash)
+            for email, flat_obj in items
+            if (email.strip(), flat_obj.hash) in index
+        }
+
+    def remember_applied(self, items: Iterable[tuple[str, Any]]) -> None:
+        self._index().update((email, flat_obj.hash) for email, flat_obj in items)
 
     def record_application(self, email: str, flat_obj) -> None:
+        index = self._reload_if_changed()
         io_operations.write_log_file(self.log_file_path, email, flat_obj)
+        index.add((email, flat_obj.hash))
+        self._log_mtime_ns = self._current_mtime_ns()
+
+    def record_applications(self, items: Iterable[tuple[str, Any]]) -> None:
+        items = list(items)
+        if not items:
+            return
+        index = self._reload_if_changed()
+        io_operations.write_log_entries(self.log_file_path, items)
+        index.update((email, flat_obj.hash) for email, flat_obj in items)
+        self._log_mtime_ns = self._current_mtime_ns()
 
 
 class FirestoreApplicationStore(ApplicationStore):
@@ -87,22 +255,43 @@ class FirestoreApplicationStore(ApplicationStore):
         collection: str | None = None,
         credentials_path: str | None = None,
         database: str | None = None,
+        legacy_lookup: bool = True,
+        background_writes: bool = False,
     ):
         self.project_id = project_id
         self.collection_name = collection or "wbm_applications"
         self.credentials_path = credentials_path
         self.database = database
+        # Fall back to the SHA-256 document IDs written by earlier versions for
+        # misses, copying hits to the current ID. Turn off (FIRESTORE_LEGACY_LOOKUP=0)
+        # once the collection has been migrated to save the second read.
+        self.legacy_lookup = legacy_lookup
+        # Queue single application writes for a daemon thread instead of blocking;
+        # callers must flush() before exiting or queued writes are lost
+        self.background_writes = background_writes
+        self._write_queue: queue.Queue[tuple[str, dict]] | None = None
+        # Doc ids waiting on the background writer, and entries it failed to commit
+        self._queued_writes: set[str] = set()
+        self._failed_writes: list[tuple[str, dict]] = []
         self._client: Any | None = None
         self._collection: Any | None = None
         self._google_api_error: type[Exception] | None = None
+        # Applications are never withdrawn, so a known doc id needs no re-check
+        self._known_applied: set[str] = set()
+        # Legacy IDs are never written anymore, so a legacy miss stays a miss
+        self._legacy_misses: set[str] = set()
 
     def initialize(self) -> None:
-        self._client, self._google_api_error = firestore_support.create_firestore_client(
-            project_id=self.project_id,
-            database=self.database,
-            credentials_path=self.credentials_path,
+        self._client, self._google_api_error = (
+            firestore_support.create_firestore_client(
+                project_id=self.project_id,
+                database=self.database,
+                credentials_path=self.credentials_path,
+            )
         )
         self._collection = self._client.collection(self.collection_name)
+        if self.background_writes:
+            self._start_background_writer()
 
         LOG.info(
             color_me.cyan(
@@ -113,18 +302,29 @@ class FirestoreApplicationStore(ApplicationStore):
         )
 
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def _normalize_email(email: str) -> str:
+        # Profiles reuse a handful of addresses for the whole session
         return (email or "").strip().lower()
 
     @classmethod
     def _doc_id(cls, email: str, flat_hash: str) -> str:
-        normalized_email = cls._normalize_email(email)
-        digest = hashlib.sha256(f"{normalized_email}|{flat_hash}".encode("utf-8"))
-        return digest.hexdigest()
+        # The same listings are checked on every refresh, so memoize the digest
+        return _hashed_doc_id(cls._normalize_email(email), flat_hash)
+
+    @classmethod
+    def _legacy_doc_id(cls, email: str, flat_hash: str) -> str:
+        return _legacy_hashed_doc_id(cls._normalize_email(email), flat_hash)
 
     @staticmethod
-    def _build_entry(email: str, flat_obj) -> dict:
-        applied_date = constants.current_date().isoformat()
+    def _build_entry(
+        email: str,
+        flat_obj,
+        *,
+        applied_date: str | None = None,
+        created_at: str | None = None,
+    ) -> dict:
+        applied_date = applied_date or constants.current_date().isoformat()
         street = flat_obj.street
         zip_code = flat_obj.zip_code
         return {
@@ -140,9 +340,14 @@ class FirestoreApplicationStore(ApplicationStore):
             "size": misc_operations.convert_size(flat_obj.size),
             "rooms": misc_operations.get_zimmer_count(flat_obj.rooms),
             "wbs?": flat_obj.wbs,
-            "created_at": constants.utc_now().isoformat(),
+            "created_at": created_at or constants.utc_now().isoformat(),
         }
 
+    def _require_client(self):
+        if not self._client:
+            raise RuntimeError("Firestore store not initialized.")
+        return self._client
+
     def _require_collection(self):
         if not self._collection:
             raise RuntimeError("Firestore store not initialized.")
@@ -154,22 +359,159 @@ class FirestoreApplicationStore(ApplicationStore):
         return self._google_api_error
 
     def has_applied(self, email: str, flat_obj) -> bool:
+        return bool(self.applied_keys([(email, flat_obj)]))
+
+    def applied_keys(self, items: Iterable[tuple[str, Any]]) -> set[tuple[str, str]]:
+        """
+        Check all items with a single get_all() call instead of one read per document.
+        With legacy_lookup, misses are retried under their legacy IDs, at most
+        once per document per process.
+        """
+
+        applied: set[tuple[str, str]] = set()
+        pending: dict[str, list[tuple[str, str]]] = {}
+        legacy_ids: dict[str, str] = {}
+        for email, flat_obj in items:
+            key = (email, flat_obj.hash)
+            doc_id = self._doc_id(email, flat_obj.hash)
+            if doc_id in self._known_applied or doc_id in self._queued_writes:
+                applied.add(key)
+                continue
+            pending.setdefault(doc_id, []).append(key)
+            legacy_ids[doc_id] = self._legacy_doc_id(email, flat_obj.hash)
+        if not pending:
+            return applied
+
+        for snapshot in self._get_all(list(pending)):
+            if snapshot.exists and snapshot.id in pending:
+                self._known_applied.add(snapshot.id)
+                applied.update(pending.pop(snapshot.id))
+        if not pending or not self.legacy_lookup:
+            return applied
+
+        # Maps each legacy document ID back onto the current ID it answers for
+        current_ids = {
+            legacy_ids[doc_id]: doc_id
+            for doc_id in pending
+            if doc_id not in self._legacy_misses
+        }
+        if not current_ids:
+            return applied
+        migrated: list[tuple[str, dict]] = []
+        for snapshot in self._get_all(list(current_ids)):
+            current_id = current_ids.get(snapshot.id)
+            if snapshot.exists and current_id is not None:
+                self._known_applied.add(current_id)
+                applied.update(pending[current_id])
+                migrated.append((current_id, snapshot.to_dict() or {}))
+        self._legacy_misses.update(
+            doc_id
+            for doc_id in current_ids.values()
+            if doc_id not in self._known_applied
+        )
+        if migrated:
+            self._migrate_legacy_entries(migrated)
+        return applied
+
+    def _get_all(self, doc_ids: list[str]) -> list:
+        client = self._require_client()
         collection = self._require_collection()
         google_api_error = self._require_google_api_error()
-        doc_id = self._doc_id(email, flat_obj.hash)
         try:
-            return bool(collection.document(doc_id).get().exists)
+            return list(
+                client.get_all([collection.document(doc_id) for doc_id in doc_ids])
+            )
         except google_api_error as exc:
             LOG.error(color_me.red(f"Firestore read failed: {exc}"))
             raise
 
+    def _migrate_legacy_entries(self, entries: list[tuple[str, dict]]) -> None:
+        # Best effort: a failed copy only means the legacy ID is read again later
+        try:
+            for start in range(0, len(entries), firestore_support.MAX_BATCH_WRITES):
+                self._commit_batch(
+                    entries[start : start + firestore_support.MAX_BATCH_WRITES]
+                )
+        except Exception as exc:
+            LOG.warning(
+                color_me.yellow(f"Copying legacy Firestore applications failed: {exc}")
+            )
+
+    def remember_applied(self, items: Iterable[tuple[str, Any]]) -> None:
+        self._known_applied.update(
+            self._doc_id(email, flat_obj.hash) for email, flat_obj in items
+        )
+
+    def _start_background_writer(self) -> None:
+        if self._write_queue is not None:
+            return
+        self._write_queue = queue.Queue()
+        threading.Thread(
+            target=self._drain_write_queue,
+            name="firestore-application-writer",
+            daemon=True,
+        ).start()
+
+    def _drain_write_queue(self) -> None:
+        write_queue = self._write_queue
+        if write_queue is None:
+            return
+        while True:
+            entries = [write_queue.get()]
+            # Everything queued meanwhile goes out in the same commit
+            while len(entries) < firestore_support.MAX_BATCH_WRITES:
+                try:
+                    entries.append(write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                # A plain commit on this thread; a thread pool refuses new work
+                # once the interpreter starts shutting down
+                self._commit_batch(entries)
+                self._known_applied.update(doc_id for doc_id, _ in entries)
+            except Exception as exc:
+                # Kept for flush() to report; the flats no longer count as recorded
+                self._failed_writes.extend(entries)
+                LOG.error(
+                    color_me.red(
+                        "Background Firestore write failed "
+                        f"(count={len(entries)}): {exc}"
+                    )
+                )
+            finally:
+                for doc_id, _ in entries:
+                    self._queued_writes.discard(doc_id)
+                    write_queue.task_done()
+
+    def flush(self) -> None:
+        """
+        Block until every queued background write has been handled, raising a
+        RuntimeError if any of them could not be committed.
+        """
+
+        if self._write_queue is not None:
+            self._write_queue.join()
+        if self._failed_writes:
+            failed, self._failed_writes = self._failed_writes, []
+            raise RuntimeError(
+                f"{len(failed)} queued Firestore application write(s) failed "
+                f"(docs={', '.join(doc_id for doc_id, _ in failed)})"
+            )
+
     def record_application(self, email: str, flat_obj) -> None:
-        collection = self._require_collection()
-        google_api_error = self._require_google_api_error()
         doc_id = self._doc_id(email, flat_obj.hash)
         payload = self._build_entry(email, flat_obj)
+        if self._write_queue is not None:
+            # The scraping loop only needs the write to land eventually
+            self._queued_writes.add(doc_id)
+            self._write_queue.put((doc_id, payload))
+            return
+
+        collection = self._require_collection()
+        google_api_error = self._require_google_api_error()
         try:
             collection.document(doc_id).set(payload, merge=True)
+            self._known_applied.add(doc_id)
             LOG.info(
                 color_me.green(
                     "Recorded application in Firestore "
@@ -180,6 +522,84 @@ class FirestoreApplicationStore(ApplicationStore):
             LOG.error(color_me.red(f"Firestore write failed: {exc}"))
             raise
 
+    def record_applications(
+        self,
+        items: Iterable[tuple[str, Any]],
+        batch_size: int = firestore_support.MAX_BATCH_WRITES,
+    ) -> None:
+        """
+        Record many applications as WriteBatch commits of up to batch_size writes
+        (lower it under write contention), committing the batches concurrently.
+        Document IDs are deterministic, so the writes are safe to retry.
+        """
+
+        # One timestamp for the whole batch instead of one clock read per document
+        applied_date = constants.current_date().isoformat()
+        created_at = constants.utc_now().isoformat()
+        entries = [
+            (
+                self._doc_id(email, flat_obj.hash),
+                self._build_entry(
+                    email,
+                    flat_obj,
+                    applied_date=applied_date,
+                    created_at=created_at,
+                ),
+            )
+            for email, flat_obj in items
+        ]
+        if entries:
+            self._write_entries(entries, batch_size)
+
+    def _commit_batch(self, entries: list[tuple[str, dict]]) -> None:
+        client = self._require_client()
+        collection = self._require_collection()
+        batch = client.batch()
+        for doc_id, payload in entries:
+            batch.set(collection.document(doc_id), payload, merge=True)
+        firestore_support.call_with_retry(
+            batch.commit, firestore_support.get_transient_errors()
+        )
+
+    def _write_entries(
+        self,
+        entries: list[tuple[str, dict]],
+        batch_size: int = firestore_support.MAX_BATCH_WRITES,
+    ) -> None:
+        google_api_error = self._require_google_api_error()
+        batch_size = max(1, min(batch_size, firestore_support.MAX_BATCH_WRITES))
+        chunks = [
+            entries[start : start + batch_size]
+            for start in range(0, len(entries), batch_size)
+        ]
+
+        workers = min(firestore_support.MAX_COMMIT_WORKERS, len(chunks))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(self._commit_batch, chunks))
+        except google_api_error as exc:
+            LOG.error(color_me.red(f"Firestore batch write failed: {exc}"))
+            raise
+        self._known_applied.update(doc_id for doc_id, _ in entries)
+        LOG.info(
+            color_me.green(
+                f"Recorded applications in Firestore (count={len(entries)}) ✅"
+            )
+        )
+
+
+def build_composite_store(
+    stores, label: str | None = None, cache_fill: bool = True
+) -> ApplicationStore:
+    """
+    Combine stores into a CompositeApplicationStore, returning a lone store as is.
+    """
+
+    stores = [store for store in (stores or []) if store]
+    if len(stores) == 1:
+        return stores[0]
+    return CompositeApplicationStore(stores, label=label, cache_fill=cache_fill)
+
 
 def build_application_store(
     backend: str,
@@ -188,6 +608,8 @@ def build_application_store(
     collection: str | None = None,
     credentials_path: str | None = None,
     database: str | None = None,
+    legacy_lookup: bool = True,
+    background_writes: bool = False,
 ) -> ApplicationStore:
     backend = (backend or "file").strip().lower()
     if backend == "firestore":
@@ -196,5 +618,7 @@ def build_application_store(
             collection=collection,
             credentials_path=credentials_path,
             database=database,
+            legacy_lookup=legacy_lookup,
+            background_writes=background_writes,
         )
     return FileApplicationStore(log_file_path)
@@ -1,10 +1,16 @@
-import json
+import copy
+import hashlib
 import os
+import shutil
+import tempfile
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal
 
 from wbmbot_v3.logger import wbm_logger
-from wbmbot_v3.utility import firestore_support, io_operations
+from wbmbot_v3.utility import firestore_support, io_operations, json_support
 
 __appname__ = os.path.splitext(os.path.basename(__file__))[0]
 color_me = wbm_logger.ColoredLogger(__appname__)
@@ -19,6 +25,25 @@ class ConfigStore(ABC):
     def load_config(self, config_key: str | None = None):
         raise NotImplementedError
 
+    def load_configs(self, config_keys) -> dict[str, dict]:
+        """
+        Load several configs by key; keys without a config are left out.
+        """
+
+        configs = {}
+        for config_key in config_keys:
+            try:
+                configs[config_key] = self.load_config(config_key)
+            except FileNotFoundError:
+                continue
+        return configs
+
+    def exists(self, config_key: str) -> bool:
+        try:
+            return bool(self.load_config(config_key))
+        except FileNotFoundError:
+            return False
+
     @abstractmethod
     def list_configs(self):
         raise NotImplementedError
@@ -27,25 +52,97 @@ class ConfigStore(ABC):
     def save_config(self, config_key: str, config: dict) -> None:
         raise NotImplementedError
 
+    def save_configs(self, items: dict[str, dict]) -> None:
+        for config_key, config in items.items():
+            self.save_config(config_key, config)
+
 
 class FileConfigStore(ConfigStore):
     def __init__(self, path: str, allow_prompt: bool = True):
         self.path = path
         self.allow_prompt = allow_prompt
+        # (st_mtime_ns, digest) of the file as this store last wrote it
+        self._last_written: tuple[int, bytes] | None = None
+        # (st_mtime_ns, config) of the last parsed config
+        self._cached_config: tuple[int, dict] | None = None
+
+    def _mtime_ns(self) -> int | None:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
 
     def load_config(self, config_key: str | None = None):
+        """
+        Load the config, reusing the last parse while the file is unchanged.
+        """
+
+        mtime_ns = self._mtime_ns()
+        if (
+            mtime_ns is not None
+            and self._cached_config is not None
+            and self._cached_config[0] == mtime_ns
+        ):
+            return copy.deepcopy(self._cached_config[1])
+
         if self.allow_prompt:
-            return io_operations.load_wbm_config(self.path)
-        return io_operations.load_wbm_config_no_prompt(self.path)
+            config = io_operations.load_wbm_config(self.path)
+        else:
+            config = io_operations.load_wbm_config_no_prompt(self.path)
+
+        # The prompt may have just created the file, so stat it again
+        mtime_ns = self._mtime_ns()
+        self._cached_config = (
+            (mtime_ns, copy.deepcopy(config))
+            if config and mtime_ns is not None
+            else None
+        )
+        return config
 
     def list_configs(self):
         config = self.load_config()
         return [config] if config else []
 
+    def _current_digest(self) -> tuple[int, bytes] | None:
+        mtime_ns = self._mtime_ns()
+        if mtime_ns is None:
+            return None
+        if self._last_written and self._last_written[0] == mtime_ns:
+            return self._last_written
+        with open(self.path, "rb") as infile:
+            return mtime_ns, hashlib.blake2b(infile.read(), digest_size=16).digest()
+
     def save_config(self, config_key: str, config: dict) -> None:
-        io_operations.create_directory_if_not_exists(os.path.dirname(self.path))
-        with open(self.path, "w", encoding="utf-8") as outfile:
-            json.dump(config, outfile, indent=4, ensure_ascii=False)
+        """
+        Write the config atomically, skipping the write when nothing changed.
+        """
+
+        payload = json_support.dumps(config, indent=True)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        current = self._current_digest()
+        if current is not None and current[1] == digest:
+            self._last_written = current
+            return
+
+        directory = os.path.dirname(self.path)
+        io_operations.create_directory_if_not_exists(directory)
+        # Write to a sibling temp file and rename it over the config, so a crash
+        # mid-write leaves the previous config intact
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=directory or ".", prefix=".wbm_config.", delete=False
+        ) as outfile:
+            outfile.write(payload)
+        try:
+            # Keep the permissions of the config being replaced
+            if current is not None:
+                shutil.copymode(self.path, outfile.name)
+            os.replace(outfile.name, self.path)
+        except OSError:
+            os.unlink(outfile.name)
+            raise
+        self._last_written = (os.stat(self.path).st_mtime_ns, digest)
+        # Coarse mtimes could miss a rewrite within the same tick
+        self._cached_config = None
 
 
 class FirestoreConfigStore(ConfigStore):
@@ -55,20 +152,28 @@ class FirestoreConfigStore(ConfigStore):
         collection: str | None = None,
         credentials_path: str | None = None,
         database: str | None = None,
+        cache_ttl_seconds: float = 30.0,
+        cache_size: int = 256,
     ):
         self.project_id = project_id
         self.collection_name = collection or "wbm_users"
         self.credentials_path = credentials_path
         self.database = database
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_size = cache_size
         self._client: Any | None = None
         self._collection: Any | None = None
         self._google_api_error: type[Exception] | None = None
+        # config_key -> (monotonic fetch time, config), least recently used first
+        self._cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
 
     def initialize(self) -> None:
-        self._client, self._google_api_error = firestore_support.create_firestore_client(
-            project_id=self.project_id,
-            database=self.database,
-            credentials_path=self.credentials_path,
+        self._client, self._google_api_error = (
+            firestore_support.create_firestore_client(
+                project_id=self.project_id,
+                database=self.database,
+                credentials_path=self.credentials_path,
+            )
         )
         self._collection = self._client.collection(self.collection_name)
         LOG.info(
@@ -79,6 +184,11 @@ class FirestoreConfigStore(ConfigStore):
             )
         )
 
+    def _require_client(self):
+        if not self._client:
+            raise RuntimeError("Firestore config store not initialized.")
+        return self._client
+
     def _require_collection(self):
         if not self._collection:
             raise RuntimeError("Firestore config store not initialized.")
@@ -89,13 +199,46 @@ class FirestoreConfigStore(ConfigStore):
             raise RuntimeError("Firestore config store not initialized.")
         return self._google_api_error
 
-    def load_config(self, config_key: str | None = None):
+    def _cached_config(self, config_key: str, any_age: bool) -> dict | None:
+        cached = self._cache.get(config_key)
+        if cached is None:
+            return None
+        fetched_at, data = cached
+        if not any_age and time.monotonic() - fetched_at >= self.cache_ttl_seconds:
+            return None
+        self._cache.move_to_end(config_key)
+        return copy.deepcopy(data)
+
+    def _cache_config(self, config_key: str, data: dict) -> None:
+        self._cache[config_key] = (time.monotonic(), copy.deepcopy(data))
+        self._cache.move_to_end(config_key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def load_config(
+        self,
+        config_key: str | None = None,
+        source: Literal["default", "cache", "server"] = "default",
+    ):
+        """
+        Load a config, answering repeat reads within cache_ttl_seconds from memory.
+        source="cache" accepts a cached copy of any age, source="server" always
+        reads Firestore.
+        """
+
         collection = self._require_collection()
         google_api_error = self._require_google_api_error()
         if not config_key:
             raise ValueError("config_key is required for Firestore config store.")
+        if source != "server":
+            cached = self._cached_config(config_key, any_age=source == "cache")
+            if cached is not None:
+                return cached
         try:
-            doc = collection.document(config_key).get()
+            doc = firestore_support.call_with_retry(
+                collection.document(config_key).get,
+                firestore_support.get_transient_errors(),
+            )
         except google_api_error as exc:
             LOG.error(color_me.red(f"Firestore read failed: {exc}"))
             raise
@@ -103,6 +246,70 @@ class FirestoreConfigStore(ConfigStore):
             raise FileNotFoundError(
                 f"No config found in Firestore for key '{config_key}'."
             )
+        data = self._doc_to_config(doc)
+        self._cache_config(config_key, data)
+        return data
+
+    def exists(self, config_key: str) -> bool:
+        """
+        Check for a config while only transferring its user_id field.
+        """
+
+        collection = self._require_collection()
+        google_api_error = self._require_google_api_error()
+        if not config_key:
+            raise ValueError("config_key is required for Firestore config store.")
+        if self._cached_config(config_key, any_age=False) is not None:
+            return True
+        try:
+            doc = firestore_support.call_with_retry(
+                lambda: collection.document(config_key).get(field_paths=["user_id"]),
+                firestore_support.get_transient_errors(),
+            )
+        except google_api_error as exc:
+            LOG.error(color_me.red(f"Firestore read failed: {exc}"))
+            raise
+        return bool(doc.exists)
+
+    def load_configs(self, config_keys) -> dict[str, dict]:
+        """
+        Load several configs with one get_all() call for everything not cached.
+        """
+
+        client = self._require_client()
+        collection = self._require_collection()
+        google_api_error = self._require_google_api_error()
+        config_keys = list(dict.fromkeys(config_keys))
+        if not all(config_keys):
+            raise ValueError("config_key is required for Firestore config store.")
+
+        configs: dict[str, dict] = {}
+        missing = []
+        for config_key in config_keys:
+            cached = self._cached_config(config_key, any_age=False)
+            if cached is None:
+                missing.append(config_key)
+            else:
+                configs[config_key] = cached
+        if missing:
+            refs = [collection.document(config_key) for config_key in missing]
+            try:
+                docs = firestore_support.call_with_retry(
+                    lambda: list(client.get_all(refs)),
+                    firestore_support.get_transient_errors(),
+                )
+            except google_api_error as exc:
+                LOG.error(color_me.red(f"Firestore read failed: {exc}"))
+                raise
+            for doc in docs:
+                if doc.exists:
+                    configs[doc.id] = self._doc_to_config(doc)
+                    self._cache_config(doc.id, configs[doc.id])
+        # get_all does not preserve order, so return the configs in key order
+        return {key: configs[key] for key in config_keys if key in configs}
+
+    @staticmethod
+    def _doc_to_config(doc) -> dict:
         data = doc.to_dict() or {}
         data.pop("_id", None)
         data.setdefault("user_id", doc.id)
@@ -112,35 +319,70 @@ class FirestoreConfigStore(ConfigStore):
         collection = self._require_collection()
         google_api_error = self._require_google_api_error()
         try:
-            docs = list(collection.stream())
+            docs = firestore_support.call_with_retry(
+                lambda: list(collection.stream()),
+                firestore_support.get_transient_errors(),
+            )
         except google_api_error as exc:
             LOG.error(color_me.red(f"Firestore read failed: {exc}"))
             raise
-        configs = []
-        for doc in docs:
-            data = doc.to_dict() or {}
-            data.pop("_id", None)
-            data.setdefault("user_id", doc.id)
-            configs.append(data)
-        return configs
+        return [self._doc_to_config(doc) for doc in docs]
 
     def save_config(self, config_key: str, config: dict) -> None:
+        self.save_configs({config_key: config})
+
+    def save_configs(
+        self,
+        items: dict[str, dict],
+        batch_size: int = firestore_support.MAX_BATCH_WRITES,
+    ) -> None:
+        """
+        Save many configs as WriteBatch commits of up to batch_size documents,
+        committing the batches concurrently.
+        """
+
+        client = self._require_client()
         collection = self._require_collection()
         google_api_error = self._require_google_api_error()
-        if not config_key:
+        if not all(items):
             raise ValueError("config_key is required for Firestore config store.")
-        payload = dict(config)
-        payload["user_id"] = config_key
+        entries = [
+            (config_key, {**config, "user_id": config_key})
+            for config_key, config in items.items()
+        ]
+        if not entries:
+            return
+
+        batch_size = max(1, min(batch_size, firestore_support.MAX_BATCH_WRITES))
+        chunks = [
+            entries[start : start + batch_size]
+            for start in range(0, len(entries), batch_size)
+        ]
+        retry_errors = firestore_support.get_transient_errors()
+
+        def _commit(chunk) -> None:
+            batch = client.batch()
+            for config_key, payload in chunk:
+                batch.set(collection.document(config_key), payload, merge=True)
+            firestore_support.call_with_retry(batch.commit, retry_errors)
+
+        workers = min(firestore_support.MAX_COMMIT_WORKERS, len(chunks))
         try:
-            collection.document(config_key).set(payload, merge=True)
-            LOG.info(
-                color_me.green(
-                    f"Saved WBM config in Firestore (key={config_key}) ✅"
-                )
-            )
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_commit, chunks))
         except google_api_error as exc:
             LOG.error(color_me.red(f"Firestore write failed: {exc}"))
             raise
+        finally:
+            # merge=True writes can combine with fields we never saw, so refetch
+            for config_key, _ in entries:
+                self._cache.pop(config_key, None)
+        LOG.info(
+            color_me.green(
+                "Saved WBM config(s) in Firestore "
+                f"(keys={', '.join(config_key for config_key, _ in entries)}) ✅"
+            )
+        )
 
 
 def build_config_store(
@@ -1,16 +1,46 @@
+from dataclasses import dataclass
+from typing import Any
+
 from wbmbot_v3.utility import misc_operations
 
 EligibilityDecision = tuple[bool, str | None]
 
 
-def evaluate_flat_eligibility(flat_elem, flat_obj, user_profile) -> EligibilityDecision:
+@dataclass(frozen=True)
+class FlatMetrics:
+    rent: Any
+    size: Any
+    rooms: int | None
+
+
+def measure_flat(flat_obj) -> FlatMetrics:
+    """
+    Parse the numeric rent, size and room count of a flat once.
+    """
+
+    return FlatMetrics(
+        rent=misc_operations.convert_rent(flat_obj.total_rent),
+        size=misc_operations.convert_size(flat_obj.size),
+        rooms=misc_operations.get_zimmer_count(flat_obj.rooms),
+    )
+
+
+def evaluate_flat_eligibility(
+    flat_elem,
+    flat_obj,
+    user_profile,
+    metrics: FlatMetrics | None = None,
+) -> EligibilityDecision:
     """
     Evaluate whether a flat should be processed for the given user profile.
+    Pass precomputed metrics to skip re-parsing the flat's numbers.
     """
 
     excluded, keywords = misc_operations.contains_filter_keywords(
         flat_elem,
         user_profile.exclude,
+        getattr(user_profile, "exclude_pattern", None),
+        getattr(user_profile, "normalized_exclude", None),
     )
     if excluded:
         joined_keywords = ", ".join(str(keyword) for keyword in keywords)
@@ -19,7 +49,8 @@ def evaluate_flat_eligibility(flat_elem, flat_obj, user_profile) -> EligibilityD
     if flat_obj.wbs and not user_profile.wbs:
         return False, "it requires WBS and your profile has no WBS"
 
-    flat_rent = misc_operations.convert_rent(flat_obj.total_rent)
+    metrics = metrics or measure_flat(flat_obj)
+    flat_rent = metrics.rent
     if not misc_operations.verify_flat_rent(flat_rent, user_profile.flat_rent_below):
         return (
             False,
@@ -28,7 +59,7 @@ def evaluate_flat_eligibility(flat_elem, flat_obj, user_profile) -> EligibilityD
             f"User wants it below: {user_profile.flat_rent_below} EUR",
         )
 
-    flat_size = misc_operations.convert_size(flat_obj.size)
+    flat_size = metrics.size
     if not misc_operations.verify_flat_size(flat_size, user_profile.flat_size_above):
         return (
             False,
@@ -37,7 +68,7 @@ def evaluate_flat_eligibility(flat_elem, flat_obj, user_profile) -> EligibilityD
             f"User wants it above: {user_profile.flat_size_above} m2",
         )
 
-    flat_rooms = misc_operations.get_zimmer_count(flat_obj.rooms)
+    flat_rooms = metrics.rooms
     if not misc_operations.verify_flat_rooms(flat_rooms, user_profile.flat_rooms_above):
         return (
             False,
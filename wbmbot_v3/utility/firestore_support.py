@@ -1,13 +1,17 @@
-import importlib
-import importlib.abc
-import importlib.machinery
 import os
 import sys
-from typing import Any
+import time
+from typing import Any, Callable, TypeVar
 
 _FIRESTORE = None
 _GOOGLE_API_ERROR = None
 
+# Firestore rejects commits with more than 500 writes
+MAX_BATCH_WRITES = 500
+MAX_COMMIT_WORKERS = 40
+
+T = TypeVar("T")
+
 
 def _patch_protobuf_imports_for_py314() -> None:
     """
@@ -18,9 +22,10 @@ def _patch_protobuf_imports_for_py314() -> None:
     if sys.version_info < (3, 14):
         return
 
-    os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "python")
+    import importlib.abc
+    import importlib.machinery
 
-    blocked_prefixes = ("google._upb", "google.protobuf.pyext")
+    os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "python")
 
     if not any(getattr(finder, "_wbm_blocker", False) for finder in sys.meta_path):
 
@@ -33,9 +38,11 @@ def _patch_protobuf_imports_for_py314() -> None:
 
         class _BlockUpbFinder(importlib.abc.MetaPathFinder):
             _wbm_blocker = True
+            # Consulted on every import in the process, so keep the check to one call
+            _prefixes = ("google._upb", "google.protobuf.pyext")
 
             def find_spec(self, fullname: str, path: object, target: object = None):
-                if fullname.startswith(blocked_prefixes):
+                if fullname.startswith(self._prefixes):
                     return importlib.machinery.ModuleSpec(
                         fullname,
                         _BlockUpbLoader(),
@@ -45,6 +52,11 @@ def _patch_protobuf_imports_for_py314() -> None:
         sys.meta_path.insert(0, _BlockUpbFinder())
 
 
+# Installed once at import, before anything can import protobuf
+if sys.version_info >= (3, 14):
+    _patch_protobuf_imports_for_py314()
+
+
 def configure_credentials(credentials_path: str | None) -> None:
     if credentials_path:
         os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
@@ -61,13 +73,40 @@ def get_firestore_dependencies() -> tuple[Any, type[Exception]]:
     return _FIRESTORE, _GOOGLE_API_ERROR
 
 
+def get_transient_errors() -> tuple[type[Exception], ...]:
+    """
+    Return the google-api-core errors worth retrying (contention, timeouts, blips).
+    """
+
+    from google.api_core.exceptions import Aborted, DeadlineExceeded, ServiceUnavailable
+
+    return Aborted, DeadlineExceeded, ServiceUnavailable
+
+
+def call_with_retry(
+    func: Callable[[], T],
+    retry_errors: tuple[type[Exception], ...],
+    attempts: int = 3,
+    base_delay: float = 0.1,
+) -> T:
+    """
+    Call func, retrying with exponential backoff when it raises one of retry_errors.
+    """
+
+    for attempt in range(attempts - 1):
+        try:
+            return func()
+        except retry_errors:
+            time.sleep(base_delay * 2**attempt)
+    return func()
+
+
 def create_firestore_client(
     project_id: str | None = None,
     database: str | None = None,
     credentials_path: str | None = None,
 ) -> tuple[Any, type[Exception]]:
     configure_credentials(credentials_path)
-    _patch_protobuf_imports_for_py314()
     firestore, google_api_error = get_firestore_dependencies()
     if database:
         return (
@@ -1,16 +1,22 @@
+import atexit
 import json
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
 from wbmbot_v3.helpers import constants
 from wbmbot_v3.logger import wbm_logger
-from wbmbot_v3.utility import interaction, misc_operations
+from wbmbot_v3.utility import interaction, json_support, misc_operations
 
 __appname__ = os.path.splitext(os.path.basename(__file__))[0]
 color_me = wbm_logger.ColoredLogger(__appname__)
 LOG = color_me.create_logger()
 
+# Debug log files written by a background listener, keyed by absolute path
+_DEBUG_LISTENERS: dict[str, tuple[QueueHandler, QueueListener, logging.FileHandler]] = {}
+
 
 def _load_json_file(file_name: str) -> dict[str, Any] | None:
     with open(file_name, "r", encoding="utf-8") as config_file:
@@ -52,6 +58,22 @@ def load_wbm_config_no_prompt(file_name: str):
     return None
 
 
+def load_application_log(log_file: str) -> dict[str, Any]:
+    """
+    Load the application log as ``{email: {flat_hash: entry}}``.
+    Returns an empty dict when the file is missing or unreadable.
+    """
+
+    try:
+        with open(log_file, "rb") as json_file:
+            log = json_support.loads(json_file.read())
+    except FileNotFoundError:
+        return {}
+    except json.decoder.JSONDecodeError:
+        return {}
+    return log if isinstance(log, dict) else {}
+
+
 def initialize_application_logger(log_file: str):
     """
     Checks if a file exists at the specified path and creates it if it doesn't.
@@ -71,7 +93,8 @@ def initialize_application_logger(log_file: str):
 
 def initialize_debug_logging(log_file: str) -> str | None:
     """
-    Attach a file handler to the root logger so all logs are persisted to disk.
+    Persist all root logger records to disk. Records are handed to a queue and
+    written by a background listener thread so logging never blocks on file I/O.
     Returns the log file path when initialized.
     """
 
@@ -86,21 +109,53 @@ def initialize_debug_logging(log_file: str) -> str | None:
 
     root_logger = logging.getLogger()
     log_file_abs = os.path.abspath(log_file)
+    if log_file_abs in _DEBUG_LISTENERS:
+        return log_file
     for handler in root_logger.handlers:
         if isinstance(handler, logging.FileHandler):
             if os.path.abspath(getattr(handler, "baseFilename", "")) == log_file_abs:
                 return log_file
 
-    handler = logging.FileHandler(log_file, encoding="utf-8")
+    file_handler = logging.FileHandler(log_file, encoding="utf-8")
     formatter = logging.Formatter(
         wbm_logger.BASIC_FORMAT,
         datefmt=wbm_logger.DATE_FORMAT,
     )
-    handler.setFormatter(formatter)
-    root_logger.addHandler(handler)
+    file_handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    root_logger.addHandler(queue_handler)
+
+    if not _DEBUG_LISTENERS:
+        atexit.register(stop_debug_logging)
+    _DEBUG_LISTENERS[log_file_abs] = (queue_handler, listener, file_handler)
     return log_file
 
 
+def stop_debug_logging(log_file: str | None = None) -> None:
+    """
+    Flush and detach the debug log for log_file, or every debug log when omitted.
+    """
+
+    if log_file:
+        paths = [os.path.abspath(log_file)]
+    else:
+        paths = list(_DEBUG_LISTENERS)
+
+    root_logger = logging.getLogger()
+    for path in paths:
+        handlers = _DEBUG_LISTENERS.pop(path, None)
+        if handlers is None:
+            continue
+        queue_handler, listener, file_handler = handlers
+        root_logger.removeHandler(queue_handler)
+        listener.stop()
+        file_handler.close()
+
+
 def write_log_file(log_file: str, email: str, flat_obj):
     """
     Write a nested dictionary log entry to the log file.
@@ -114,47 +169,48 @@ def write_log_file(log_file: str, email: str, flat_obj):
         None
     """
 
+    write_log_entries(log_file, [(email, flat_obj)])
+
+
+def write_log_entries(log_file: str, items) -> None:
+    """
+    Write several log entries with a single read and a single write of the log.
+
+    Parameters:
+        log_file (str): The path to the JSON log file.
+        items (iterable): (email, flat_obj) pairs to record.
+
+    Returns:
+        None
+    """
+
     # Read existing log entries
-    try:
-        with open(log_file, "r") as json_file:
-            existing_log = json.load(json_file)
-    except FileNotFoundError:
-        existing_log = {}
-    except json.decoder.JSONDecodeError:
-        existing_log = {}
-
-    # Check if email already exists in the log
-    if email in existing_log:
-        # Check if the entry with the same hash exists
-        if flat_obj.hash not in existing_log[email]:
-            existing_log[email][flat_obj.hash] = {
-                "date": constants.current_date().isoformat(),
-                "title": flat_obj.title,
-                "street": flat_obj.street,
-                "zip_code": flat_obj.zip_code,
-                "rent": misc_operations.convert_rent(flat_obj.total_rent),
-                "size": misc_operations.convert_size(flat_obj.size),
-                "rooms": misc_operations.get_zimmer_count(flat_obj.rooms),
-                "wbs?": flat_obj.wbs,
-            }
-    else:
-        # If email doesn't exist, add a new entry
-        existing_log[email] = {
-            flat_obj.hash: {
-                "date": constants.current_date().isoformat(),
-                "title": flat_obj.title,
-                "street": flat_obj.street,
-                "zip_code": flat_obj.zip_code,
-                "rent": misc_operations.convert_rent(flat_obj.total_rent),
-                "size": misc_operations.convert_size(flat_obj.size),
-                "rooms": misc_operations.get_zimmer_count(flat_obj.rooms),
-                "wbs?": flat_obj.wbs,
-            }
+    existing_log = load_application_log(log_file)
+    # Every entry written together shares the date; bind the helpers once too
+    applied_date = constants.current_date().isoformat()
+    convert_rent = misc_operations.convert_rent
+    convert_size = misc_operations.convert_size
+    get_zimmer_count = misc_operations.get_zimmer_count
+
+    for email, flat_obj in items:
+        # Skip entries that were already recorded for this email
+        entries = existing_log.setdefault(email, {})
+        if flat_obj.hash in entries:
+            continue
+        entries[flat_obj.hash] = {
+            "date": applied_date,
+            "title": flat_obj.title,
+            "street": flat_obj.street,
+            "zip_code": flat_obj.zip_code,
+            "rent": convert_rent(flat_obj.total_rent),
+            "size": convert_size(flat_obj.size),
+            "rooms": get_zimmer_count(flat_obj.rooms),
+            "wbs?": flat_obj.wbs,
         }
 
     # Write the updated log back to the file
-    with open(log_file, "w", encoding="utf-8") as json_file:
-        json.dump(existing_log, json_file, indent=4, ensure_ascii=False)
+    with open(log_file, "wb") as json_file:
+        json_file.write(json_support.dumps(existing_log, indent=True))
 
 
 def create_directory_if_not_exists(directory_path: str) -> None:
@@ -186,13 +242,7 @@ def check_flat_already_applied(log_file: str, email: str, flat_obj):
         bool: True if an application has already been sent, False otherwise.
     """
 
-    try:
-        with open(log_file, "r") as json_file:
-            log = json.load(json_file)
-    except FileNotFoundError:
-        return False
-    except json.decoder.JSONDecodeError:
-        return False
+    log = load_application_log(log_file)
 
     email = email.strip()
     if email in log:
@@ -0,0 +1,32 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Parse JSON with orjson when available, falling back to the stdlib parser.
+    Both raise a json.JSONDecodeError subclass on malformed input.
+    """
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 encoded JSON bytes, pretty-printed when indent is set.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        ensure_ascii=False,
+    ).encode("utf-8")
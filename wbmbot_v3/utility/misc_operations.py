@@ -1,109 +1,168 @@
 import re
+import socket
+import time
 
-import requests
+_NON_NUMERIC_RE = re.compile(r"[^\d.,]")
+_DIGITS_RE = re.compile(r"\d+")
+_UNIT_MULTIPLIERS = {"s": 1, "m": 60, "h": 3600}
 
+_CONNECTIVITY_PROBE = ("www.google.com", 443)
+_CONNECTIVITY_TTL_SECONDS = 5.0
+_last_online_at: float | None = None
 
-def contains_filter_keywords(flat_elem, user_filters):
+
+def compile_filter_keywords(user_filters):
+    """
+    Compile the exclude keywords into one alternation for a fast "any match?" scan.
+    Returns None when there is nothing to pre-screen with.
+    """
+
+    keywords = [str(keyword).strip().lower() for keyword in user_filters or []]
+    if not keywords or not all(keywords):
+        # No keywords, or an empty one that matches every text anyway
+        return None
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+def normalize_filters(user_filters):
+    """
+    Strip and lowercase the filter keywords once, keeping each original keyword
+    for reporting. Returns (normalized, original) pairs.
+    """
+
+    return tuple(
+        (str(keyword).strip().lower(), keyword) for keyword in user_filters or []
+    )
+
+
+def has_filter_keyword(flat_elem, normalized) -> bool:
+    """Check if the flat contains any exclude keyword, stopping at the first hit."""
+
+    flat_text = flat_elem.text.lower()
+    return any(needle in flat_text for needle, _ in normalized)
+
+
+def contains_filter_keywords(flat_elem, user_filters, pattern=None, normalized=None):
     """Check if the flat contains any of the exclude keywords and return the keywords."""
 
+    # Without keywords there is nothing to match, so skip reading the text at all
+    if not user_filters and not normalized:
+        return (False, [])
+
+    # Read the element text once; on a WebElement every access is a round-trip
+    flat_text = flat_elem.text.lower()
+
+    # A single scan rules out every keyword at once for the common no-match case
+    if pattern is not None and not pattern.search(flat_text):
+        return (False, [])
+
+    if normalized is None:
+        normalized = normalize_filters(user_filters)
+
     # Find all keywords that are in the flat_elem's text
-    keywords_found = [
-        keyword
-        for keyword in user_filters
-        if str(keyword).strip().lower() in flat_elem.text.lower()
-    ]
+    keywords_found = [keyword for needle, keyword in normalized if needle in flat_text]
 
     # Return a tuple of boolean and keywords found
     return (bool(keywords_found), keywords_found)
 
 
-def verify_flat_rent(flat_rent, user_flat_rent):
-    """Check if the flat rent is <= the user specified flat rent."""
-
-    # If the rent is "" it means the listing has some improper values and
-    # we couldn't fetch the correct numbers from the texts
-    # so we apply regardless
-    if flat_rent == "":
-        return True
+def _to_float_or_none(value) -> float | None:
+    """Convert value to float, or None when it is missing or not numeric."""
 
+    # None means the listing has some improper values and we couldn't fetch the
+    # correct numbers from the texts, so the verify_* checks apply regardless
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value is None or value == "":
+        return None
     try:
-        rent_value = float(flat_rent)
-        user_flat_rent_value = float(user_flat_rent)
+        return float(value)
     except (TypeError, ValueError):
-        return True
+        return None
+
+
+def verify_flat_rent(flat_rent, user_flat_rent):
+    """Check if the flat rent is <= the user specified flat rent."""
 
-    # Check rent numbers
-    if rent_value <= user_flat_rent_value:
+    rent_value = _to_float_or_none(flat_rent)
+    user_flat_rent_value = _to_float_or_none(user_flat_rent)
+    if rent_value is None or user_flat_rent_value is None:
         return True
-    else:
-        return False
+    return rent_value <= user_flat_rent_value
 
 
 def verify_flat_size(flat_size, user_flat_size):
     """Check if the flat size is >= the user specified flat size."""
 
-    # If the size is "" it means the listing has some improper values and
-    # we couldn't fetch the correct numbers from the texts
-    # so we apply regardless
-    if flat_size in ("", None):
+    flat_size_value = _to_float_or_none(flat_size)
+    user_flat_size_value = _to_float_or_none(user_flat_size)
+    if flat_size_value is None or user_flat_size_value is None:
         return True
-
-    try:
-        flat_size_value = float(flat_size)
-        user_flat_size_value = float(user_flat_size)
-    except (TypeError, ValueError):
-        return True
-
-    # Check size numbers
-    if flat_size_value >= user_flat_size_value:
-        return True
-    else:
-        return False
+    return flat_size_value >= user_flat_size_value
 
 
 def verify_flat_rooms(flat_rooms, user_flat_rooms):
     """Check if the flat rooms is >= the user specified flat rooms."""
 
-    # If the size is "" it means the listing has some improper values and
-    # we couldn't fetch the correct numbers from the texts
-    # so we apply regardless
-    if flat_rooms in ("", None):
+    flat_rooms_value = _to_float_or_none(flat_rooms)
+    user_flat_rooms_value = _to_float_or_none(user_flat_rooms)
+    if flat_rooms_value is None or user_flat_rooms_value is None:
         return True
+    return flat_rooms_value >= user_flat_rooms_value
 
-    try:
-        flat_rooms_value = float(flat_rooms)
-        user_flat_rooms_value = float(user_flat_rooms)
-    except (TypeError, ValueError):
-        return True
 
-    # Check size numbers
-    if flat_rooms_value >= user_flat_rooms_value:
-        return True
-    else:
+def resolve_host(host: str, port: int = 443) -> bool:
+    """
+    Cheap connectivity probe: True if host resolves through DNS, without connecting.
+    """
+
+    try:
+        socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
         return False
+    return True
 
 
 def check_internet_connection():
     """
-    Check internet connection by sending a GET request to www.google.com using HTTPS.
+    Check internet connection by opening a TCP connection to www.google.com:443.
+    A successful check is trusted for a few seconds, so back-to-back calls
+    within one bot iteration do not probe again.
 
     Returns:
         bool: True if internet connection is available, False otherwise.
     """
 
+    global _last_online_at
+    now = time.monotonic()
+    if (
+        _last_online_at is not None
+        and now - _last_online_at < _CONNECTIVITY_TTL_SECONDS
+    ):
+        return True
+
     try:
-        response = requests.get("https://www.google.com", timeout=1)
-        return response.status_code in [200, 201, 204]
-    except requests.Timeout:
-        return False
-    except requests.ConnectionError:
-        return False
-    except requests.TooManyRedirects:
-        return False
-    except requests.InvalidURL:
-        return False
-    except requests.RequestException:
+        # A bare TCP connect skips the TLS handshake and HTTP round-trip
+        socket.create_connection(_CONNECTIVITY_PROBE, timeout=1).close()
+    except OSError:
         return False
+    _last_online_at = now
+    return True
+
+
+def _parse_european_number(text: str) -> float:
+    """
+    Parse the number in text, treating the last "," or "." as the decimal point
+    and dropping any earlier ones as thousands separators.
+    Raises ValueError when text holds no number.
+    """
+
+    numeric_string = _NON_NUMERIC_RE.sub("", text)
+    decimal_index = max(numeric_string.rfind(","), numeric_string.rfind("."))
+    if decimal_index < 0:
+        return float(numeric_string)
+    integer_part = numeric_string[:decimal_index].replace(",", "").replace(".", "")
+    return float(f"{integer_part}.{numeric_string[decimal_index + 1 :]}")
 
 
 def convert_rent(rent_text: str) -> str:
@@ -124,19 +183,7 @@ def convert_rent(rent_text: str) -> str:
     if "€" not in rent_text:
         return ""
 
-    # Remove non-numeric characters
-    numeric_string = re.sub(r"[^\d.,]", "", rent_text)
-
-    # Replace comma with dot for decimal point uniformity
-    numeric_string = numeric_string.replace(",", ".")
-
-    # Remove extra dots in thousands separators
-    numeric_string = numeric_string.replace(".", "", numeric_string.count(".") - 1)
-
-    # Convert to float
-    numeric_value = float(numeric_string)
-
-    return numeric_value
+    return _parse_european_number(rent_text)
 
 
 def convert_size(size_text: str) -> str:
@@ -157,19 +204,7 @@ def convert_size(size_text: str) -> str:
     if "m²" not in size_text:
         return 0.0
 
-    # Remove non-numeric characters
-    numeric_string = re.sub(r"[^\d.,]", "", size_text)
-
-    # Replace comma with dot for decimal point uniformity
-    numeric_string = numeric_string.replace(",", ".")
-
-    # Remove extra dots in thousands separators
-    numeric_string = numeric_string.replace(".", "", numeric_string.count(".") - 1)
-
-    # Convert to float
-    numeric_value = float(numeric_string)
-
-    return numeric_value
+    return _parse_european_number(size_text)
 
 
 def get_zimmer_count(text: str) -> int:
@@ -190,9 +225,9 @@ def get_zimmer_count(text: str) -> int:
     if not text:
         return None
 
-    matches = re.findall(r"\d+", str(text))
-    if matches:
-        return int(matches[0])
+    match = _DIGITS_RE.search(str(text))
+    if match:
+        return int(match.group())
 
     return None
 
@@ -215,17 +250,15 @@ def parse_delay_to_seconds(value, default_seconds: int = 10) -> int:
     if isinstance(value, (int, float)):
         return max(int(value), 0)
 
-    match = re.match(r"^\s*(\d+(?:\.\d*)?)\s*([smhSMH]?)\s*$", str(value))
-    if not match:
-        return max(default_seconds, 0)
-
-    amount = float(match.group(1))
-    unit = match.group(2).lower() if match.group(2) else "s"
-
+    # Accepts digits with an optional ".fraction" and an optional s/m/h suffix
+    text = str(value).strip()
     multiplier = 1
-    if unit == "m":
-        multiplier = 60
-    elif unit == "h":
-        multiplier = 3600
+    if text and text[-1] in "smhSMH":
+        multiplier = _UNIT_MULTIPLIERS[text[-1].lower()]
+        text = text[:-1].rstrip()
+    whole, _, fraction = text.partition(".")
+    if not whole.isdecimal() or (fraction and not fraction.isdecimal()):
+        return max(default_seconds, 0)
 
+    amount = float(text)
     return max(int(amount * multiplier), 0)